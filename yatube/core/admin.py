@@ -0,0 +1,43 @@
+from django.contrib import admin
+
+from .mail import send_outbox
+from .models import Job, OutboxMessage
+
+
+class CachedChoicesMixin:
+    """Один список вариантов FK на весь changelist.
+
+    Иначе каждая строка list_editable заново выполняет запрос
+    к связанной таблице, чтобы отрисовать свой select.
+    """
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        view_name = getattr(request.resolver_match, 'url_name', '') or ''
+        if (db_field.name in self.list_editable
+                and view_name.endswith('_changelist')):
+            formfield = db_field.formfield(**kwargs)
+            formfield.choices = list(formfield.choices)
+            return formfield
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'state', 'attempts', 'run_after',
+                    'locked_until')
+    list_filter = ('state', 'name')
+    readonly_fields = ('last_error',)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'failed', 'attempts', 'locked_until', 'created')
+    list_filter = ('failed',)
+    exclude = ('message',)
+    readonly_fields = ('last_error',)
+    actions = ('retry',)
+
+    def retry(self, request, queryset):
+        queryset.update(failed=False, attempts=0, locked_until=None)
+        send_outbox.delay(unique=True)
+    retry.short_description = 'Отправить ещё раз'
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_is_shared():
+    """Кеш по умолчанию общий для всех процессов: воркеров и команд."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if cache_is_shared():
+        return []
+    return [Warning(
+        'Кеш по умолчанию свой в каждом процессе: инвалидация по '
+        'сигналам, лимиты частоты, популярные посты и slow_queries '
+        'работают только внутри одного воркера.',
+        hint='Задайте общий кеш через CACHE_BACKEND и CACHE_LOCATION.',
+        id='core.W001',
+    )]
@@ -0,0 +1,116 @@
+import json
+import logging
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def task(func):
+    """Добавляет функции метод delay, который ставит её в очередь."""
+    func.delay = lambda **kwargs: enqueue(func, **kwargs)
+    return func
+
+
+def task_name(func):
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def enqueue(func, *, unique=False, delay=0,
+            max_attempts=None, **kwargs):
+    """Ставит задачу в очередь после фиксации текущей транзакции.
+
+    Задача не появится, если транзакция откатится, и не увидит
+    незафиксированных данных. С unique=True задача не дублируется,
+    пока в очереди ждёт такая же, которая запустится не позже новой:
+    отложенный повтор не задерживает срочную задачу. Аргументы должны
+    сериализоваться в JSON.
+    """
+    name = task_name(func)
+    payload = json.dumps(kwargs, sort_keys=True)
+
+    def create():
+        run_after = timezone.now() + timedelta(seconds=delay)
+        if unique and Job.objects.filter(
+            name=name, payload=payload, state=Job.PENDING,
+            locked_until__isnull=True, run_after__lte=run_after
+        ).exists():
+            return
+        Job.objects.create(
+            name=name,
+            payload=payload,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_after=run_after
+        )
+
+    transaction.on_commit(create)
+
+
+def claim(batch_size):
+    """Забирает до batch_size готовых задач на JOB_VISIBILITY_TIMEOUT.
+
+    Задача, которую воркер не завершил за это время (например, он
+    упал), снова становится видна остальным.
+    """
+    now = timezone.now()
+    ready = Q(state=Job.PENDING, run_after__lte=now) & (
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    ids = list(
+        Job.objects.filter(ready).values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    Job.objects.filter(ready, pk__in=ids).update(
+        locked_by=token,
+        locked_until=now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+    )
+    return list(Job.objects.filter(locked_by=token))
+
+
+def run(job):
+    """Выполняет задачу; при ошибке откладывает её с растущей паузой."""
+    try:
+        import_string(job.name)(**json.loads(job.payload))
+    except Exception:
+        job.attempts += 1
+        job.last_error = traceback.format_exc()
+        job.locked_by = ''
+        job.locked_until = None
+        if job.attempts >= job.max_attempts:
+            job.state = Job.FAILED
+            logger.error('Задача %s не выполнена: %s', job, job.last_error)
+        else:
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        job.save()
+        return False
+    else:
+        Job.objects.filter(pk=job.pk).delete()
+        return True
+    finally:
+        connection.close()
+
+
+def work(batch_size=10, threads=1):
+    """Выполняет одну порцию задач. Возвращает число взятых задач."""
+    jobs = claim(batch_size)
+    if threads == 1:
+        for job in jobs:
+            run(job)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(run, jobs))
+    return len(jobs)
@@ -0,0 +1,110 @@
+import copy
+import logging
+import pickle
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from .jobs import task
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Складывает письма в core.OutboxMessage вместо отправки.
+
+    Запрос не ждёт почтовый сервер: письма отправляет задача
+    send_outbox через OUTBOX_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        rows = []
+        for message in email_messages:
+            message = copy.copy(message)
+            message.connection = None
+            rows.append(OutboxMessage(message=pickle.dumps(message)))
+        if not rows:
+            return 0
+        OutboxMessage.objects.bulk_create(rows)
+        send_outbox.delay(unique=True)
+        return len(rows)
+
+
+def claim(batch_size):
+    """Забирает до batch_size писем на JOB_VISIBILITY_TIMEOUT."""
+    now = timezone.now()
+    ready = Q(failed=False) & (
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    )
+    ids = list(
+        OutboxMessage.objects.filter(ready)
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    locked_until = now + timedelta(seconds=settings.JOB_VISIBILITY_TIMEOUT)
+    OutboxMessage.objects.filter(ready, pk__in=ids).update(
+        locked_until=locked_until
+    )
+    return list(OutboxMessage.objects.filter(
+        pk__in=ids, locked_until=locked_until
+    ))
+
+
+def postpone(row):
+    """Откладывает письмо с растущей паузой или, после
+    OUTBOX_MAX_ATTEMPTS попыток, помечает его неотправленным.
+    """
+    row.attempts += 1
+    row.last_error = traceback.format_exc()
+    if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        row.failed = True
+        row.locked_until = None
+        logger.error('Письмо #%s не отправлено: %s', row.pk, row.last_error)
+    else:
+        row.locked_until = timezone.now() + timedelta(
+            seconds=settings.OUTBOX_RETRY_DELAY * 2 ** (row.attempts - 1)
+        )
+    row.save(update_fields=['attempts', 'last_error', 'failed',
+                            'locked_until'])
+
+
+@task
+def send_outbox(batch_size=None):
+    """Отправляет письма по одному через общее соединение OUTBOX_BACKEND.
+
+    Письмо удаляется сразу после отправки, поэтому сбой посреди порции
+    не отправит уже доставленные письма повторно. Письмо, которое не
+    ушло, откладывается, и для него ставится новая задача ко времени
+    повтора. Возвращает число отправленных писем.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    sent = 0
+    with get_connection(settings.OUTBOX_BACKEND) as connection:
+        while True:
+            rows = claim(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                try:
+                    connection.send_messages(
+                        [pickle.loads(bytes(row.message))]
+                    )
+                except Exception:
+                    postpone(row)
+                else:
+                    OutboxMessage.objects.filter(pk=row.pk).delete()
+                    sent += 1
+    retry_at = OutboxMessage.objects.filter(
+        failed=False, attempts__gt=0
+    ).aggregate(retry_at=Min('locked_until'))['retry_at']
+    if retry_at is not None:
+        send_outbox.delay(
+            unique=True,
+            delay=max((retry_at - timezone.now()).total_seconds(), 0)
+        )
+    return sent
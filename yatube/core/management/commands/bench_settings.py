@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import get_resolver
+
+PROFILES = ('yatube.settings.dev', 'yatube.settings.prod')
+DEFAULT_PATHS = ('/', '/about/author/', '/about/tech/')
+# Замер сбрасывает кеш перед каждым запросом: на prod-хосте это не
+# должен быть общий memcached.
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench_settings',
+    }
+}
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает время запуска и обработки запросов '
+            'для профилей настроек dev и prod.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--child', action='store_true',
+                            help='Служебный режим: замер в текущем процессе.')
+        parser.add_argument('--started', type=float)
+
+    def handle(self, *args, paths, requests, child, started, **options):
+        if child:
+            with override_settings(CACHES=BENCH_CACHES):
+                result = self.measure(paths, requests, started)
+            self.stdout.write(json.dumps(result))
+            return
+        results = {profile: self.spawn(profile, paths, requests)
+                   for profile in PROFILES}
+        for profile, result in results.items():
+            self.stdout.write(
+                f'{profile}: запуск {result["startup_ms"]:.1f} мс, '
+                f'первый запрос {result["first_ms"]:.1f} мс, '
+                f'запрос {result["request_ms"]:.2f} мс'
+            )
+        dev, prod = (results[profile] for profile in PROFILES)
+        startup = dev['startup_ms'] - prod['startup_ms']
+        request = dev['request_ms'] - prod['request_ms']
+        self.stdout.write(
+            f'Экономия prod: запуск {startup:.1f} мс, запрос {request:.2f} мс'
+        )
+
+    def spawn(self, profile, paths, requests):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=profile)
+        env.setdefault('SECRET_KEY', 'bench-settings-only')
+        command = [
+            sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'),
+            'bench_settings', '--child', '--requests', str(requests),
+            '--started', str(time.time()), *paths,
+        ]
+        output = subprocess.run(
+            command, env=env, check=True, stdout=subprocess.PIPE
+        ).stdout
+        return json.loads(output)
+
+    def measure(self, paths, requests, started):
+        WSGIHandler()
+        get_resolver().url_patterns
+        startup = time.time() - started
+
+        client = Client(SERVER_NAME='localhost')
+        begin = time.perf_counter()
+        for path in paths:
+            client.get(path)
+        first = (time.perf_counter() - begin) / len(paths)
+
+        elapsed = 0
+        for _ in range(requests):
+            for path in paths:
+                cache.clear()
+                begin = time.perf_counter()
+                client.get(path)
+                elapsed += time.perf_counter() - begin
+        return {
+            'startup_ms': startup * 1000,
+            'first_ms': first * 1000,
+            'request_ms': elapsed * 1000 / (requests * len(paths)),
+        }
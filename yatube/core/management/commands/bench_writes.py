@@ -0,0 +1,71 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from core.writer import SerialWriter
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность записи комментариев из '
+            'нескольких потоков напрямую и через поток-писатель. '
+            'Пишет в настроенную БД и удаляет свои данные по окончании.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--writes', type=int, default=100,
+                            help='Записей на поток.')
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, threads, writes, batch_size, **options):
+        author, _ = User.objects.get_or_create(username='bench_writes')
+        post = Post.objects.create(text='bench_writes', author=author)
+        try:
+            direct = self.run(threads, writes, lambda func: func())
+            writer = SerialWriter(batch_size)
+            queued = self.run(
+                threads, writes, lambda func: writer.submit(func).result()
+            )
+        finally:
+            post.delete()
+            author.delete()
+        for name, (elapsed, done, locked) in (
+            ('напрямую', direct), ('через очередь', queued)
+        ):
+            self.stdout.write(
+                f'{name}: {done / elapsed:.0f} записей/с, '
+                f'записано {done}, «database is locked»: {locked}'
+            )
+
+    def run(self, threads, writes, execute):
+        post = Post.objects.get(text='bench_writes')
+        counters = {'done': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def worker():
+            for number in range(writes):
+                comment = Comment(post=post, author=post.author,
+                                  text=f'Комментарий {number}')
+                try:
+                    execute(comment.save)
+                except OperationalError:
+                    key = 'locked'
+                else:
+                    key = 'done'
+                with lock:
+                    counters[key] += 1
+            connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        return (time.perf_counter() - started,
+                counters['done'], counters['locked'])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.profiler import make_token
+
+
+class Command(BaseCommand):
+    help = ('Выдаёт токен для заголовка X-Profile-Token, с которым '
+            'запрос профилируется без входа сотрудником.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_token())
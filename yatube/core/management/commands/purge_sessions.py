@@ -0,0 +1,42 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = ('Удаляет истёкшие сессии небольшими порциями, '
+            'чтобы не блокировать таблицу django_session.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--sleep', type=float, default=0.05,
+            help='Пауза между порциями в секундах.'
+        )
+
+    def handle(self, *args, batch_size, sleep, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        if not hasattr(engine.SessionStore, 'get_model_class'):
+            self.stdout.write('Сессии не хранятся в базе данных.')
+            return
+        session_model = engine.SessionStore.get_model_class()
+        total = 0
+        while True:
+            keys = list(
+                session_model.objects.filter(
+                    expire_date__lt=timezone.now()
+                ).values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            with transaction.atomic():
+                session_model.objects.filter(session_key__in=keys).delete()
+            total += len(keys)
+            if len(keys) < batch_size:
+                break
+            time.sleep(sleep)
+        self.stdout.write(f'Удалено сессий: {total}')
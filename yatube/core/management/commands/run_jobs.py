@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import work
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди core.Job.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument(
+            '--poll', type=float, default=1,
+            help='Пауза в секундах, когда очередь пуста.'
+        )
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и выйти.')
+
+    def handle(self, *args, threads, batch_size, poll, once, **options):
+        total = 0
+        while True:
+            done = work(batch_size, threads)
+            total += done
+            if once and not done:
+                break
+            if not done:
+                time.sleep(poll)
+        self.stdout.write(f'Обработано задач: {total}')
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import slowlog
+from core.checks import cache_is_shared
+
+
+class Command(BaseCommand):
+    help = ('Показывает медленные запросы, сгруппированные по отпечатку '
+            'SQL, с числом вызовов, суммарным временем и планом.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--reset', action='store_true',
+                            help='Очистить сводку после вывода.')
+
+    def handle(self, *args, limit, reset, **options):
+        if not cache_is_shared():
+            raise CommandError(
+                'Кеш по умолчанию свой в каждом процессе: сводка воркеров '
+                'команде не видна. Задайте общий кеш.'
+            )
+        entries = slowlog.entries()
+        if not entries:
+            self.stdout.write('Медленных запросов нет.')
+        for entry in entries[:limit]:
+            self.stdout.write(
+                f'{entry["count"]} раз, всего {entry["total"]:.1f} мс, '
+                f'в среднем {entry["total"] / entry["count"]:.1f} мс, '
+                f'максимум {entry["max"]:.1f} мс, view {entry["view"]}'
+            )
+            self.stdout.write(f'  {entry["sql"]}')
+            self.stdout.write(f'  параметры: {entry["params"]}')
+            for line in entry['plan'] or ['план ещё не снят']:
+                self.stdout.write(f'  | {line}')
+        if reset:
+            slowlog.reset()
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='failed',
+            field=models.BooleanField(default=False, verbose_name='Не отправлено'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='last_error',
+            field=models.TextField(blank=True, verbose_name='Последняя ошибка'),
+        ),
+    ]
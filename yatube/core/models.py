@@ -0,0 +1,61 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    FAILED = 'failed'
+    STATES = (
+        (PENDING, 'Ожидает'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    payload = models.TextField(default='{}', verbose_name='Аргументы')
+    state = models.CharField(max_length=10, choices=STATES, default=PENDING,
+                             verbose_name='Состояние')
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name='Попытки')
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5,
+        verbose_name='Наибольшее число попыток'
+    )
+    run_after = models.DateTimeField(default=timezone.now,
+                                     verbose_name='Выполнить после')
+    locked_by = models.CharField(max_length=32, blank=True,
+                                 verbose_name='Воркер')
+    locked_until = models.DateTimeField(blank=True, null=True,
+                                        verbose_name='Занята до')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created = models.DateTimeField(auto_now_add=True,
+                                   verbose_name='Создана')
+
+    class Meta:
+        ordering = ['run_after']
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [models.Index(fields=['state', 'run_after'])]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
+
+
+class OutboxMessage(models.Model):
+    message = models.BinaryField(verbose_name='Письмо')
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name='Попытки')
+    locked_until = models.DateTimeField(blank=True, null=True,
+                                        verbose_name='Занято до')
+    failed = models.BooleanField(default=False,
+                                 verbose_name='Не отправлено')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created = models.DateTimeField(auto_now_add=True,
+                                   verbose_name='Создано')
+
+    class Meta:
+        ordering = ['pk']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'Письмо #{self.pk}'
@@ -0,0 +1,121 @@
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.http import Http404
+
+MISSING = '<missing>'
+aliases = {}
+
+
+def version_key(model):
+    return f'obj:{model._meta.label_lower}:version'
+
+
+def model_version(model):
+    key = version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def object_key(model, field, value, version=None):
+    """Ключ объекта; значение хешируется, чтобы кириллица и пробелы
+    в slug и username не попадали в ключ memcached.
+    """
+    if version is None:
+        version = model_version(model)
+    digest = md5(str(value).encode()).hexdigest()
+    return f'obj:{model._meta.label_lower}:{version}:{field}:{digest}'
+
+
+def get_by_pk(model, pk, version):
+    key = object_key(model, 'pk', pk, version)
+    obj = cache.get(key)
+    if obj == MISSING:
+        raise model.DoesNotExist
+    if obj is None:
+        obj = model._default_manager.filter(pk=pk).first()
+        if obj is None:
+            cache.set(key, MISSING, settings.OBJECT_CACHE_MISS_TIMEOUT)
+            raise model.DoesNotExist
+        cache.set(key, obj, settings.OBJECT_CACHE_TIMEOUT)
+    return obj
+
+
+def get_cached(model, **lookup):
+    """Находит объект по pk или по полю, зарегистрированному в register.
+
+    Поле хранит в кеше только pk, сам объект лежит под ключом pk.
+    Поэтому после переименования старое значение поля перестаёт
+    находить объект, хотя ключ с ним остаётся до истечения срока.
+    Промахи тоже кешируются, на OBJECT_CACHE_MISS_TIMEOUT.
+    """
+    (field, value), = lookup.items()
+    version = model_version(model)
+    if field in ('pk', 'id'):
+        return get_by_pk(model, value, version)
+    key = object_key(model, field, value, version)
+    pk = cache.get(key)
+    if pk == MISSING:
+        raise model.DoesNotExist
+    if pk is not None:
+        try:
+            obj = get_by_pk(model, pk, version)
+        except model.DoesNotExist:
+            obj = None
+        if obj is not None and getattr(obj, field) == value:
+            return obj
+    obj = model._default_manager.filter(**lookup).first()
+    if obj is None:
+        cache.set(key, MISSING, settings.OBJECT_CACHE_MISS_TIMEOUT)
+        raise model.DoesNotExist
+    cache.set(key, obj.pk, settings.OBJECT_CACHE_TIMEOUT)
+    cache.set(object_key(model, 'pk', obj.pk, version), obj,
+              settings.OBJECT_CACHE_TIMEOUT)
+    return obj
+
+
+def get_cached_or_404(model, **lookup):
+    try:
+        return get_cached(model, **lookup)
+    except model.DoesNotExist:
+        raise Http404(f'{model._meta.object_name} не найден')
+
+
+def forget(model, pks):
+    version = model_version(model)
+    cache.delete_many([object_key(model, 'pk', pk, version) for pk in pks])
+
+
+def invalidate_model(model):
+    """Сбрасывает все объекты модели сразу, например после UPDATE,
+    который меняет видимость многих строк.
+    """
+    cache.set(version_key(model), time.time_ns(), None)
+
+
+def drop_instance(sender, instance, **kwargs):
+    version = model_version(sender)
+    cache.delete_many(
+        [object_key(sender, 'pk', instance.pk, version)]
+        + [object_key(sender, field, getattr(instance, field), version)
+           for field in aliases[sender]]
+    )
+
+
+def register(model, *fields):
+    """Включает сброс кеша модели по сигналам сохранения и удаления.
+
+    Сохранение убирает и отрицательные записи для значений полей,
+    чтобы новый объект находился сразу.
+    """
+    aliases[model] = fields
+    post_save.connect(drop_instance, sender=model,
+                      dispatch_uid=f'objects:{model._meta.label_lower}')
+    post_delete.connect(drop_instance, sender=model,
+                        dispatch_uid=f'objects:{model._meta.label_lower}')
@@ -0,0 +1,87 @@
+import threading
+import time
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = md5(f'{sql}{params}'.encode()).hexdigest()
+    return f'paginator:count:{digest}'
+
+
+def store_count(key, count):
+    if count >= settings.PAGINATOR_ESTIMATE_THRESHOLD:
+        cache.set(key, (count, time.time()), None)
+    else:
+        cache.delete(key)
+
+
+def refresh_count(queryset, key):
+    try:
+        store_count(key, queryset.count())
+    finally:
+        cache.delete(f'{key}:lock')
+        connections.close_all()
+
+
+class CachedCountPaginator(Paginator):
+    """Пагинатор, который не выполняет COUNT(*) на каждой странице.
+
+    Небольшие выборки считаются точно. Для выборок больше
+    PAGINATOR_ESTIMATE_THRESHOLD число записей берётся из кеша, а
+    устаревшее значение пересчитывается в фоновом потоке.
+    """
+
+    ELLIPSIS = '…'
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        key = count_cache_key(self.object_list)
+        cached = cache.get(key)
+        if cached is None:
+            count = self.object_list.count()
+            store_count(key, count)
+            return count
+        count, counted_at = cached
+        if time.time() - counted_at > settings.PAGINATOR_COUNT_TTL:
+            self.refresh_in_background(key)
+        return count
+
+    def refresh_in_background(self, key):
+        if not cache.add(f'{key}:lock', True, settings.PAGINATOR_COUNT_TTL):
+            return
+        threading.Thread(
+            target=refresh_count,
+            args=(self.object_list.all(), key),
+            daemon=True
+        ).start()
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=1):
+        """Номера страниц вокруг текущей, первые и последние.
+
+        Пропущенные участки обозначаются ELLIPSIS.
+        """
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
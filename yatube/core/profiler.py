@@ -0,0 +1,115 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+
+TRIGGER_PARAM = '_profile'
+TOKEN_HEADER = 'HTTP_X_PROFILE_TOKEN'
+TOKEN_SALT = 'core.profiler'
+
+
+def make_token():
+    """Подписанный токен для заголовка X-Profile-Token."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def valid_token(token):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILER_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+class StackSampler:
+    """Снимает стек потока каждые interval секунд.
+
+    Стеки копятся в свёрнутом виде «корень;...;лист число», который
+    принимают flamegraph.pl и speedscope.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} '
+                             f'({os.path.basename(code.co_filename)}:'
+                             f'{frame.f_lineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n'
+                       for stack, count in self.stacks.items())
+
+
+class ProfilerMiddleware:
+    """Профилирует отдельный запрос по требованию.
+
+    Запрос с параметром _profile от сотрудника или с действительным
+    заголовком X-Profile-Token выполняется под cProfile и сэмплером
+    стеков. В PROFILER_DIR пишутся .prof для pstats/snakeviz и
+    .collapsed для флейм-графа, их имена возвращаются в заголовке
+    X-Profile-Files. Остальные запросы проходят через одну проверку
+    словаря, а без PROFILER_DIR middleware отключается целиком.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_DIR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = request.META.get(TOKEN_HEADER)
+        if token is None and TRIGGER_PARAM not in request.GET:
+            return self.get_response(request)
+        if not (valid_token(token) if token else request.user.is_staff):
+            return self.get_response(request)
+        return self.profile(request)
+
+    def profile(self, request):
+        sampler = StackSampler(threading.get_ident(),
+                               settings.PROFILER_SAMPLE_INTERVAL)
+        profiler = cProfile.Profile()
+        sampler.start()
+        try:
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            sampler.stop()
+        match = request.resolver_match
+        name = '{}-{}'.format(
+            time.strftime('%Y%m%d-%H%M%S'),
+            (match.view_name if match else 'request').replace(':', '.')
+        )
+        os.makedirs(settings.PROFILER_DIR, exist_ok=True)
+        base = os.path.join(settings.PROFILER_DIR, name)
+        profiler.dump_stats(f'{base}.prof')
+        with open(f'{base}.collapsed', 'w') as collapsed:
+            collapsed.write(sampler.collapsed())
+        response['X-Profile-Files'] = f'{name}.prof, {name}.collapsed'
+        return response
@@ -0,0 +1,125 @@
+import logging
+import os
+import traceback
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryRecorder:
+    """Обёртка execute, которая запоминает SQL и место его вызова."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, params, project_stack()))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self, name, limit):
+        lines = [f'{name}: {len(self)} запросов при бюджете {limit}']
+        for number, (sql, params, stack) in enumerate(self.queries, 1):
+            lines.append(f'{number}. {sql} {params}')
+            lines.extend(f'     {frame}' for frame in stack)
+        return '\n'.join(lines)
+
+
+def project_stack():
+    """Кадры стека из кода проекта, без Django и сторонних пакетов."""
+    return [
+        f'{os.path.relpath(frame.filename, settings.BASE_DIR)}:'
+        f'{frame.lineno} {frame.name}'
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(settings.BASE_DIR)
+        and frame.filename != __file__
+        and 'site-packages' not in frame.filename
+    ]
+
+
+@contextmanager
+def record_queries():
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def enforce(name, limit, recorder):
+    """Логирует превышение бюджета или падает, смотря по
+    QUERY_BUDGET_MODE.
+    """
+    if len(recorder) <= limit:
+        return
+    report = recorder.report(name, limit)
+    if settings.QUERY_BUDGET_MODE == 'raise':
+        raise QueryBudgetExceeded(report)
+    logger.warning(report)
+
+
+@contextmanager
+def max_queries(limit, name='блок'):
+    """Для тестов: падает со списком SQL, если запросов больше limit."""
+    with record_queries() as recorder:
+        yield recorder
+    if len(recorder) > limit:
+        raise QueryBudgetExceeded(recorder.report(name, limit))
+
+
+def query_budget(limit):
+    """Объявляет наибольшее число запросов, которое делает view.
+
+    Проверка включается настройкой QUERY_BUDGET_MODE, без неё
+    декоратор только передаёт управление view. Бюджет считается при
+    прогретом хранилище миниатюр sorl: первая выдача каждой картинки
+    читает и пишет thumbnail_kvstore по запросу на строку.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.QUERY_BUDGET_MODE:
+                return view(request, *args, **kwargs)
+            with record_queries() as recorder:
+                response = view(request, *args, **kwargs)
+            enforce(view.__qualname__, limit, recorder)
+            return response
+        wrapper.query_budget = limit
+        return wrapper
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """Проверяет бюджеты QUERY_BUDGETS по имени URL для всего запроса.
+
+    View с декоратором query_budget проверяются самим декоратором.
+    Предназначено для разработки: обёртка execute на каждом запросе
+    стоит времени.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_MODE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        match = request.resolver_match
+        if match is None or hasattr(match.func, 'query_budget'):
+            return response
+        limit = settings.QUERY_BUDGETS.get(match.view_name)
+        if limit is not None:
+            enforce(match.view_name, limit, recorder)
+        return response
@@ -0,0 +1,121 @@
+import math
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """Разбирает строку вида '10/m' в (10, 60)."""
+    limit, _, period = rate.partition('/')
+    return int(limit), RATE_PERIODS[period]
+
+
+def client_ip(request):
+    """Адрес клиента из заголовка RATELIMIT_IP_HEADER.
+
+    За обратным прокси REMOTE_ADDR — адрес прокси. Тогда берут
+    X-Forwarded-For: каждый из RATELIMIT_TRUSTED_PROXIES своих прокси
+    дописывает в конец адрес, с которого к нему пришли, а левее может
+    стоять что угодно от клиента.
+    """
+    header = settings.RATELIMIT_IP_HEADER
+    if header == 'REMOTE_ADDR':
+        return request.META.get('REMOTE_ADDR', '')
+    addresses = [address.strip() for address
+                 in request.META.get(header, '').split(',')
+                 if address.strip()]
+    if not addresses:
+        return request.META.get('REMOTE_ADDR', '')
+    return addresses[-min(settings.RATELIMIT_TRUSTED_PROXIES, len(addresses))]
+
+
+def client_ident(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{client_ip(request)}'
+
+
+def consume(scope, ident, rate):
+    """Забирает токен из корзины клиента.
+
+    Корзина вмещает limit токенов и целиком пополняется в начале
+    каждого периода. Счётчик меняется только атомарным cache.incr;
+    лимит общий для всех воркеров, только если общий кеш.
+    Возвращает число секунд до пополнения, если токены кончились.
+    """
+    limit, period = parse_rate(rate)
+    now = time.time()
+    window = int(now // period)
+    key = f'ratelimit:{scope}:{ident}:{window}'
+    cache.add(key, 0, period)
+    try:
+        used = cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, period)
+        used = 1
+    if used > limit:
+        return math.ceil((window + 1) * period - now)
+    return None
+
+
+def too_many_requests(retry_after):
+    response = HttpResponse('Слишком много запросов', status=429)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def ratelimit(scope, rate, methods=None):
+    """Ограничивает частоту вызовов view для пользователя или IP.
+
+    Лимит по умолчанию переопределяется настройкой RATELIMITS[scope],
+    значение None в ней снимает ограничение.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            current = settings.RATELIMITS.get(scope, rate)
+            if current and (methods is None or request.method in methods):
+                retry_after = consume(scope, client_ident(request), current)
+                if retry_after:
+                    return too_many_requests(retry_after)
+            return view(request, *args, **kwargs)
+        wrapper.ratelimit_scope = scope
+        return wrapper
+    return decorator
+
+
+class RateLimitMiddleware:
+    """Общий лимит RATELIMIT_GLOBAL на все запросы клиента и лимиты
+    RATELIMITS для view без декоратора ratelimit, по имени URL.
+    """
+
+    def __init__(self, get_response):
+        if not settings.RATELIMIT_GLOBAL and not settings.RATELIMITS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        ident = client_ident(request)
+        if settings.RATELIMIT_GLOBAL:
+            retry_after = consume('global', ident, settings.RATELIMIT_GLOBAL)
+            if retry_after:
+                return too_many_requests(retry_after)
+        if hasattr(view_func, 'ratelimit_scope'):
+            return None
+        scope = request.resolver_match.view_name
+        rate = settings.RATELIMITS.get(scope)
+        if rate:
+            retry_after = consume(scope, ident, rate)
+            if retry_after:
+                return too_many_requests(retry_after)
+        return None
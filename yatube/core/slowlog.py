@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+INDEX_KEY = 'slowlog:index'
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LISTS = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+SPACES = re.compile(r'\s+')
+
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='explain')
+# Снимаемые сейчас планы; готовые удаляются сами.
+pending = set()
+lock = threading.Lock()
+
+
+def normalize(sql):
+    """Приводит SQL к виду без литералов и длины списков IN."""
+    sql = LITERALS.sub('?', sql)
+    sql = PLACEHOLDER_LISTS.sub('(...)', sql)
+    return SPACES.sub(' ', sql).strip()
+
+
+def fingerprint(sql):
+    return md5(normalize(sql).encode()).hexdigest()
+
+
+def entry_key(digest):
+    return f'slowlog:{digest}'
+
+
+def explain(alias, sql, params):
+    """План запроса на отдельном соединении фонового потока."""
+    connection = connections[alias]
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    )
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return [' '.join(map(str, row)) for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def store_plan(digest, alias, sql, params):
+    plan = explain(alias, sql, params)
+    with lock:
+        entry = cache.get(entry_key(digest))
+        if entry is not None:
+            entry['plan'] = plan
+            cache.set(entry_key(digest), entry, None)
+
+
+def record(alias, sql, params, duration, view):
+    """Учитывает медленный запрос в сводке по его отпечатку.
+
+    Сводка лежит в кеше: с общим кешем (см. core.checks) её видят все
+    воркеры и команда slow_queries. Обновление не атомарно между
+    процессами: при гонке теряется одно наблюдение.
+    План снимается один раз на отпечаток, в фоновом потоке.
+    """
+    digest = fingerprint(sql)
+    with lock:
+        entry = cache.get(entry_key(digest))
+        if entry is None:
+            entry = {
+                'sql': normalize(sql),
+                'count': 0,
+                'total': 0.0,
+                'max': 0.0,
+                'plan': None,
+            }
+            index = cache.get(INDEX_KEY, set())
+            index.add(digest)
+            cache.set(INDEX_KEY, index, None)
+        needs_plan = entry['count'] == 0
+        entry['count'] += 1
+        entry['total'] += duration
+        entry['max'] = max(entry['max'], duration)
+        entry['view'] = view
+        entry['params'] = repr(params)[:200]
+        cache.set(entry_key(digest), entry, None)
+    if needs_plan and sql.lstrip().upper().startswith('SELECT'):
+        future = executor.submit(store_plan, digest, alias, sql, params)
+        pending.add(future)
+        future.add_done_callback(pending.discard)
+
+
+def wait():
+    """Дожидается планов, снимаемых в фоне."""
+    for future in list(pending):
+        future.result()
+
+
+def entries():
+    digests = cache.get(INDEX_KEY, set())
+    found = cache.get_many([entry_key(digest) for digest in digests])
+    return sorted(found.values(), key=lambda entry: entry['total'],
+                  reverse=True)
+
+
+def reset():
+    digests = cache.get(INDEX_KEY, set())
+    cache.delete_many([entry_key(digest) for digest in digests] + [INDEX_KEY])
+
+
+class SlowQueryRecorder:
+    def __init__(self, alias, request):
+        self.alias = alias
+        self.request = request
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+                match = self.request.resolver_match
+                record(self.alias, sql, params, duration,
+                       match.view_name if match else self.request.path)
+
+
+class SlowQueryMiddleware:
+    """Пишет в сводку запросы дольше SLOW_QUERY_THRESHOLD_MS."""
+
+    def __init__(self, get_response):
+        if settings.SLOW_QUERY_THRESHOLD_MS is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(
+                    SlowQueryRecorder(alias, request)
+                ))
+            return self.get_response(request)
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.template.base import Node, Template, TextNode, VariableNode
+
+local = threading.local()
+
+
+class TemplateTimings:
+    """Время и число вызовов шаблонов, тегов и фильтров за запрос.
+
+    Время включающее: в шаблон входят его include, в include — шаблон,
+    который он подключает.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = Counter()
+
+    @contextmanager
+    def measure(self, key):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[key] += (time.perf_counter() - started) * 1000
+            self.counts[key] += 1
+
+    def server_timing(self, limit):
+        """Значение заголовка Server-Timing, его показывают devtools."""
+        slowest = sorted(self.totals.items(), key=lambda item: item[1],
+                         reverse=True)[:limit]
+        return ', '.join(
+            f'tpl{number};desc="{key} x{self.counts[key]}";dur={total:.2f}'
+            for number, (key, total) in enumerate(slowest)
+        )
+
+
+def node_key(node):
+    if isinstance(node, TextNode):
+        return None
+    if isinstance(node, VariableNode):
+        filters = node.filter_expression.filters
+        if not filters:
+            return None
+        return 'filter ' + '|'.join(func.__name__ for func, _ in filters)
+    token = getattr(node, 'token', None)
+    if token is None:
+        return f'tag {type(node).__name__}'
+    return f'tag {token.split_contents()[0]}'
+
+
+def install():
+    """Оборачивает рендер шаблонов и узлов замерами.
+
+    Пока в потоке нет активного замера, обёртки сразу вызывают
+    исходные методы.
+    """
+    if getattr(Template._render, 'profiled', False):
+        return
+    render_template = Template._render
+    render_node = Node.render_annotated
+
+    def _render(self, context):
+        timings = getattr(local, 'timings', None)
+        if timings is None:
+            return render_template(self, context)
+        with timings.measure(f'template {self.name}'):
+            return render_template(self, context)
+
+    def render_annotated(self, context):
+        timings = getattr(local, 'timings', None)
+        key = node_key(self) if timings is not None else None
+        if key is None:
+            return render_node(self, context)
+        with timings.measure(key):
+            return render_node(self, context)
+
+    _render.profiled = True
+    Template._render = _render
+    Node.render_annotated = render_annotated
+
+
+class TemplateProfilerMiddleware:
+    """Добавляет к ответу заголовок Server-Timing с самыми долгими
+    шаблонами, тегами и фильтрами. Включается TEMPLATE_PROFILER.
+    """
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILER:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        local.timings = timings = TemplateTimings()
+        try:
+            response = self.get_response(request)
+        finally:
+            local.timings = None
+        if timings.totals:
+            response['Server-Timing'] = timings.server_timing(
+                settings.TEMPLATE_PROFILER_TOP
+            )
+        return response
@@ -6,3 +6,12 @@ register = template.Library()
 @register.filter
 def addclass(field, css):
     return field.as_widget(attrs={'class': css})
+
+
+@register.filter
+def elided_page_range(page):
+    """Окно номеров страниц вокруг текущей вместо полного page_range."""
+    paginator = page.paginator
+    if hasattr(paginator, 'get_elided_page_range'):
+        return paginator.get_elided_page_range(page.number)
+    return paginator.page_range
@@ -0,0 +1,62 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.backends import user_cache_key
+
+User = get_user_model()
+
+
+class CachedUserBackendTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='cached')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_user_loaded_without_queries(self):
+        """Повторный запрос не обращается к сессиям и пользователям в БД."""
+        url = reverse('about:author')
+        self.authorized_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(url)
+        self.assertEqual(response.context['user'], self.user)
+
+    def test_user_save_drops_cache(self):
+        """Смена пароля сбрасывает закешированного пользователя."""
+        self.authorized_client.get(reverse('about:author'))
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.user.set_password('new-password-123')
+        self.user.save()
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+
+class PurgeSessionsTest(TestCase):
+    def test_expired_sessions_removed(self):
+        """Команда удаляет только истёкшие сессии."""
+        now = timezone.now()
+        Session.objects.create(
+            session_key='expired', session_data='',
+            expire_date=now - timezone.timedelta(days=1)
+        )
+        Session.objects.create(
+            session_key='alive', session_data='',
+            expire_date=now + timezone.timedelta(days=1)
+        )
+        call_command(
+            'purge_sessions', batch_size=1, sleep=0, stdout=StringIO()
+        )
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['alive']
+        )
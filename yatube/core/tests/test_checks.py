@@ -0,0 +1,18 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import check_shared_cache
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def test_process_local_cache_warns(self):
+        self.assertEqual(
+            [warning.id for warning in check_shared_cache(None)],
+            ['core.W001']
+        )
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/tmp/yatube-cache',
+    }})
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_shared_cache(None), [])
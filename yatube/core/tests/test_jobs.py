@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.jobs import claim, enqueue, task, work
+from core.models import Job
+
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+def explode():
+    raise ValueError('Сбой')
+
+
+class JobQueueTest(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_on_commit_only(self):
+        """Задача появляется только после фиксации транзакции."""
+        try:
+            with transaction.atomic():
+                remember.delay(value='откат')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(Job.objects.exists())
+        with transaction.atomic():
+            remember.delay(value='готово')
+            remember.delay(value='готово', unique=True)
+            self.assertFalse(Job.objects.exists())
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(work(threads=2), 1)
+        self.assertEqual(calls, ['готово'])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOB_RETRY_DELAY=10)
+    def test_failures_back_off_then_fail(self):
+        enqueue(explode, max_attempts=2)
+        work()
+        job = Job.objects.get()
+        self.assertEqual((job.state, job.attempts), (Job.PENDING, 1))
+        self.assertGreater(job.run_after,
+                           timezone.now() + timedelta(seconds=5))
+        self.assertIn('Сбой', job.last_error)
+        self.assertEqual(work(), 0)
+        Job.objects.update(run_after=timezone.now())
+        work()
+        self.assertEqual(Job.objects.get().state, Job.FAILED)
+
+    def test_visibility_timeout(self):
+        """Задачу упавшего воркера забирают после истечения срока."""
+        enqueue(remember, value=1)
+        self.assertEqual(len(claim(10)), 1)
+        self.assertEqual(claim(10), [])
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(work(), 1)
+        self.assertEqual(calls, [1])
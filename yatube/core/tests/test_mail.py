@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.jobs import work
+from core.mail import send_outbox
+from core.models import Job, OutboxMessage
+
+User = get_user_model()
+
+connections = []
+
+
+class CountingBackend(EmailBackend):
+    def open(self):
+        connections.append([])
+        return True
+
+    def send_messages(self, messages):
+        connections[-1].append(len(messages))
+        return super().send_messages(messages)
+
+
+class PickyBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any(message.subject == 'Плохое' for message in messages):
+            raise ConnectionError('Адрес отклонён')
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxBackend',
+    OUTBOX_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+)
+class OutboxTest(TransactionTestCase):
+    def setUp(self):
+        connections.clear()
+
+    def test_password_reset_goes_through_outbox(self):
+        User.objects.create_user(username='user', email='user@example.com',
+                                 password='pass')
+        response = Client().post(reverse('users:password_reset'),
+                                 {'email': 'user@example.com'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        self.assertEqual(Job.objects.count(), 1)
+        work()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['user@example.com'])
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    @override_settings(OUTBOX_BACKEND='core.tests.test_mail.CountingBackend')
+    def test_messages_share_one_connection(self):
+        for number in range(5):
+            mail.send_mail(f'Тема {number}', 'Текст', None, ['a@example.com'])
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(send_outbox(batch_size=2), 5)
+        self.assertEqual(connections, [[1] * 5])
+        self.assertEqual([message.subject for message in mail.outbox],
+                         [f'Тема {number}' for number in range(5)])
+
+    @override_settings(OUTBOX_BACKEND='core.tests.test_mail.PickyBackend',
+                       OUTBOX_MAX_ATTEMPTS=2)
+    def test_bad_message_does_not_resend_batch(self):
+        """Сбой одного письма не отправляет соседей повторно и после
+        OUTBOX_MAX_ATTEMPTS попыток перестаёт повторяться.
+        """
+        for subject in ('Первое', 'Плохое', 'Третье'):
+            mail.send_mail(subject, 'Текст', None, ['a@example.com'])
+        work()
+        self.assertEqual([message.subject for message in mail.outbox],
+                         ['Первое', 'Третье'])
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.attempts, 1)
+        self.assertFalse(message.failed)
+        self.assertIn('Адрес отклонён', message.last_error)
+        retry = Job.objects.get()
+        self.assertEqual(retry.attempts, 0)
+        self.assertGreater(retry.run_after, timezone.now())
+        OutboxMessage.objects.update(locked_until=timezone.now())
+        Job.objects.update(run_after=timezone.now())
+        work()
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.attempts, message.failed), (2, True))
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_new_mail_does_not_wait_for_retry(self):
+        """Новое письмо уходит сразу, даже если ждёт отложенный повтор."""
+        send_outbox.delay(unique=True, delay=480)
+        mail.send_mail('Срочное', 'Текст', None, ['a@example.com'])
+        self.assertEqual(Job.objects.count(), 2)
+        work()
+        self.assertEqual([message.subject for message in mail.outbox],
+                         ['Срочное'])
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertGreater(Job.objects.get().run_after, timezone.now())
@@ -0,0 +1,51 @@
+import warnings
+
+from django.contrib.auth import get_user_model
+from django.core.cache import CacheKeyWarning, cache
+from django.http import Http404
+from django.test import TestCase
+
+from core.objects import get_cached, get_cached_or_404
+from posts.models import Group
+
+User = get_user_model()
+
+
+class ObjectCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.group = Group.objects.create(
+            title='Коты', slug='cats', description='Про котов'
+        )
+
+    def test_hits_skip_database(self):
+        get_cached(Group, slug='cats')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached(Group, slug='cats'), self.group)
+            self.assertEqual(get_cached(Group, pk=self.group.pk), self.group)
+
+    def test_keys_are_memcached_safe(self):
+        user = User.objects.create_user(username='Лев Толстой')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            self.assertEqual(get_cached(User, username='Лев Толстой'), user)
+
+    def test_save_and_delete_invalidate(self):
+        """Изменение видно сразу, старый slug больше не находит группу."""
+        get_cached(Group, slug='cats')
+        self.group.slug = 'kittens'
+        self.group.save()
+        self.assertEqual(get_cached(Group, slug='kittens').slug, 'kittens')
+        with self.assertRaises(Group.DoesNotExist):
+            get_cached(Group, slug='cats')
+        self.group.delete()
+        with self.assertRaises(Group.DoesNotExist):
+            get_cached(Group, slug='kittens')
+
+    def test_misses_are_cached_until_created(self):
+        with self.assertRaises(Http404):
+            get_cached_or_404(User, username='ghost')
+        with self.assertNumQueries(0), self.assertRaises(Http404):
+            get_cached_or_404(User, username='ghost')
+        ghost = User.objects.create_user(username='ghost')
+        self.assertEqual(get_cached(User, username='ghost'), ghost)
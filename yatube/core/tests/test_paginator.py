@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.paginator import CachedCountPaginator
+from posts.models import Post
+
+User = get_user_model()
+
+
+class CachedCountPaginatorTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='paginator')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.author)
+            for number in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_small_list_counted_exactly(self):
+        """Небольшие выборки считаются заново на каждой странице."""
+        CachedCountPaginator(Post.objects.all(), 10).count
+        Post.objects.create(text='Новый пост', author=self.author)
+        paginator = CachedCountPaginator(Post.objects.all(), 10)
+        self.assertEqual(paginator.count, 4)
+
+    @override_settings(PAGINATOR_ESTIMATE_THRESHOLD=1,
+                       PAGINATOR_COUNT_TTL=3600)
+    def test_large_list_uses_cached_count(self):
+        """Для больших выборок число записей берётся из кеша."""
+        CachedCountPaginator(Post.objects.all(), 10).count
+        Post.objects.create(text='Новый пост', author=self.author)
+        with self.assertNumQueries(0):
+            count = CachedCountPaginator(Post.objects.all(), 10).count
+        self.assertEqual(count, 3)
+
+    def test_elided_page_range(self):
+        """Показываются первая, последняя и ±3 страницы вокруг текущей."""
+        paginator = CachedCountPaginator(range(1000), 10)
+        ellipsis = CachedCountPaginator.ELLIPSIS
+        self.assertEqual(
+            list(paginator.get_elided_page_range(50)),
+            [1, ellipsis, 47, 48, 49, 50, 51, 52, 53, ellipsis, 100]
+        )
+        self.assertEqual(
+            list(paginator.get_elided_page_range(1)),
+            [1, 2, 3, 4, ellipsis, 100]
+        )
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.profiler import make_token
+
+User = get_user_model()
+TEMP_PROFILER_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(PROFILER_DIR=TEMP_PROFILER_DIR)
+class ProfilerTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_PROFILER_DIR, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:index')
+
+    def profile_files(self, response):
+        names = response.get('X-Profile-Files')
+        if names is None:
+            return []
+        return [os.path.join(TEMP_PROFILER_DIR, name)
+                for name in names.split(', ')]
+
+    def test_staff_request_is_profiled(self):
+        self.client.force_login(
+            User.objects.create_user(username='staff', is_staff=True)
+        )
+        prof, collapsed = self.profile_files(
+            self.client.get(self.url, {'_profile': 1})
+        )
+        self.assertTrue(prof.endswith('posts.index.prof'))
+        self.assertGreater(os.path.getsize(prof), 0)
+        with open(collapsed) as stacks:
+            for line in stacks:
+                self.assertRegex(line, r'^\S.* \d+$')
+
+    def test_signed_header_is_profiled(self):
+        response = self.client.get(self.url, HTTP_X_PROFILE_TOKEN=make_token())
+        self.assertEqual(len(self.profile_files(response)), 2)
+
+    def test_others_are_not_profiled(self):
+        self.client.force_login(User.objects.create_user(username='reader'))
+        for headers in ({}, {'HTTP_X_PROFILE_TOKEN': 'forged'}):
+            with self.subTest(headers=headers):
+                response = self.client.get(self.url, {'_profile': 1},
+                                           **headers)
+                self.assertEqual(self.profile_files(response), [])
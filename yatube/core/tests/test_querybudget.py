@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core.querybudget import QueryBudgetExceeded, max_queries, query_budget
+
+User = get_user_model()
+
+
+@query_budget(1)
+def greedy_view(request):
+    list(User.objects.all())
+    list(User.objects.all())
+    return HttpResponse()
+
+
+class QueryBudgetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_decorator_raises_with_sql(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'auth_user'):
+            greedy_view(RequestFactory().get('/'))
+
+    @override_settings(QUERY_BUDGET_MODE='log')
+    def test_decorator_logs_with_stack(self):
+        with self.assertLogs('core.querybudget', 'WARNING') as logs:
+            greedy_view(RequestFactory().get('/'))
+        self.assertIn('2 запросов при бюджете 1', logs.output[0])
+        self.assertIn('test_querybudget.py', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE='raise',
+                       QUERY_BUDGETS={'about:author': 0})
+    def test_middleware_checks_url_budgets(self):
+        """Middleware проверяет бюджет URL без декоратора."""
+        self.client.force_login(User.objects.create_user(username='reader'))
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get(reverse('about:author'))
+
+    def test_max_queries(self):
+        with max_queries(1):
+            User.objects.count()
+        with self.assertRaises(QueryBudgetExceeded):
+            with max_queries(0):
+                User.objects.count()
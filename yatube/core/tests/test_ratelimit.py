@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (Client, RequestFactory, TestCase,
+                         override_settings)
+from django.urls import reverse
+
+from core.ratelimit import client_ip
+from posts.models import Post
+
+User = get_user_model()
+
+
+class RateLimitTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='hammer')
+        cls.post = Post.objects.create(text='Текст', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    @override_settings(RATELIMITS={'posts:add_comment': '2/m'})
+    def test_add_comment_limited(self):
+        """Лишний комментарий получает 429 с Retry-After."""
+        url = reverse('posts:add_comment', args=[self.post.pk])
+        for _ in range(2):
+            response = self.authorized_client.post(url, {'text': 'Ещё'})
+            self.assertEqual(response.status_code, 302)
+        response = self.authorized_client.post(url, {'text': 'Ещё'})
+        self.assertEqual(response.status_code, 429)
+        self.assertLessEqual(int(response['Retry-After']), 60)
+        self.assertEqual(self.post.comments.count(), 2)
+
+    @override_settings(RATELIMITS={'posts:add_comment': '1/m'})
+    def test_get_not_limited(self):
+        """Лимит комментариев распространяется только на POST."""
+        url = reverse('posts:add_comment', args=[self.post.pk])
+        for _ in range(3):
+            response = self.authorized_client.get(url)
+            self.assertEqual(response.status_code, 302)
+
+    def test_limit_without_queries(self):
+        """Проверка лимита не добавляет запросов к БД."""
+        url = reverse('posts:profile_follow', args=[self.user.username])
+        self.authorized_client.get(url)
+        with self.settings(RATELIMITS={'posts:profile_follow': '1/m'}):
+            with self.assertNumQueries(0):
+                response = self.authorized_client.get(url)
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(RATELIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR',
+                       RATELIMIT_TRUSTED_PROXIES=1)
+    def test_client_ip_behind_proxy(self):
+        """За прокси клиент — последний адрес X-Forwarded-For, подделанные
+        клиентом адреса левее не учитываются.
+        """
+        factory = RequestFactory()
+        request = factory.get('/', HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4',
+                              REMOTE_ADDR='10.0.0.1')
+        self.assertEqual(client_ip(request), '1.2.3.4')
+        self.assertEqual(client_ip(factory.get('/', REMOTE_ADDR='10.0.0.1')),
+                         '10.0.0.1')
+        with self.settings(RATELIMIT_IP_HEADER='REMOTE_ADDR'):
+            self.assertEqual(client_ip(request), '10.0.0.1')
@@ -0,0 +1,59 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core import slowlog
+
+User = get_user_model()
+
+
+class SlowLogTest(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        shared = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }})
+        shared.enable()
+        self.addCleanup(shared.disable)
+        cache.clear()
+
+    def test_normalize_groups_literals_and_in_lists(self):
+        self.assertEqual(
+            slowlog.fingerprint('SELECT * FROM t WHERE id IN (%s, %s) '
+                                "AND name = 'a' LIMIT 10"),
+            slowlog.fingerprint('SELECT  * FROM t WHERE id IN (%s, %s, %s) '
+                                "AND name = 'b' LIMIT 20")
+        )
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_requests_are_aggregated_with_plan(self):
+        """Повторные запросы складываются в одну запись с планом."""
+        url = reverse('posts:group_index')
+        for _ in range(2):
+            cache.delete('groups:directory')
+            self.client.get(url)
+        slowlog.wait()
+        entry = next(entry for entry in slowlog.entries()
+                     if 'posts_group' in entry['sql'])
+        self.assertEqual(entry['count'], 2)
+        self.assertEqual(entry['view'], 'posts:group_index')
+        self.assertTrue(entry['plan'])
+        out = StringIO()
+        call_command('slow_queries', '--reset', stdout=out)
+        self.assertIn('posts_group', out.getvalue())
+        self.assertEqual(slowlog.entries(), [])
+
+    def test_command_needs_shared_cache(self):
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}):
+            with self.assertRaises(CommandError):
+                call_command('slow_queries', stdout=StringIO())
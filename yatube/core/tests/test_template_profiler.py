@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(TEMPLATE_PROFILER=True, TEMPLATE_PROFILER_TOP=100)
+class TemplateProfilerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_server_timing_lists_templates_tags_and_filters(self):
+        author = User.objects.create_user(username='writer')
+        post = Post.objects.create(text='Текст', author=author)
+        self.client.force_login(author)
+        response = self.client.get(
+            reverse('posts:post_detail', args=[post.pk])
+        )
+        timing = response['Server-Timing']
+        self.assertIn('desc="template posts/post_detail.html x1"', timing)
+        self.assertIn('desc="tag include', timing)
+        self.assertRegex(timing, r'desc="filter addclass x\d+";dur=[\d.]+')
+
+    @override_settings(TEMPLATE_PROFILER=False)
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse('posts:index'))
+        self.assertFalse(response.has_header('Server-Timing'))
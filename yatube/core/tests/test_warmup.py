@@ -0,0 +1,22 @@
+from django.core.cache import cache
+from django.core.wsgi import get_wsgi_application
+from django.test import TestCase
+
+from core.warmup import warm_up
+
+
+class WarmUpTest(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_all_steps_logged(self):
+        """Прогрев выполняет все шаги и логирует их длительность."""
+        application = get_wsgi_application()
+        with self.assertLogs('core.warmup', level='INFO') as logs:
+            timings = warm_up(application)
+        self.assertEqual(
+            list(timings),
+            ['urlconf', 'templates', 'translations', 'cache', 'database']
+        )
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn('Прогрев воркера', logs.output[0])
@@ -0,0 +1,72 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TransactionTestCase
+
+from core.writer import SerialWriter, WriteTimeout
+from posts.models import Follow
+
+User = get_user_model()
+
+
+class SerialWriterTest(TransactionTestCase):
+    def setUp(self):
+        self.writer = SerialWriter(batch_size=10)
+        self.authors = [
+            User.objects.create_user(username=f'writer_{number}')
+            for number in range(20)
+        ]
+        self.reader = User.objects.create_user(username='writer_reader')
+
+    def test_concurrent_writes_serialized(self):
+        """Записи из разных потоков выполняются и возвращают результат."""
+        results = []
+
+        def follow(author):
+            results.append(self.writer.submit(
+                Follow.objects.create, user=self.reader, author=author
+            ).result(5))
+
+        threads = [threading.Thread(target=follow, args=(author,))
+                   for author in self.authors]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 20)
+        self.assertEqual(self.reader.follower.count(), 20)
+
+    def test_failed_write_does_not_break_batch(self):
+        """Ошибка одной записи не откатывает остальные в пачке."""
+        author = self.authors[0]
+        futures = [
+            self.writer.submit(
+                Follow.objects.create, user=self.reader, author=author
+            )
+            for _ in range(2)
+        ]
+        futures[0].result(5)
+        with self.assertRaises(IntegrityError):
+            futures[1].result(5)
+        self.assertEqual(self.reader.follower.count(), 1)
+
+    def test_timed_out_write_is_cancelled(self):
+        """Запись, не дождавшаяся очереди, не выполняется позже."""
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        blocker = self.writer.submit(block)
+        started.wait(5)
+        with self.assertRaises(WriteTimeout):
+            self.writer.call(
+                0.05, Follow.objects.create,
+                user=self.reader, author=self.authors[0]
+            )
+        release.set()
+        blocker.result(5)
+        self.writer.submit(lambda: None).result(5)
+        self.assertEqual(self.reader.follower.count(), 0)
@@ -0,0 +1,100 @@
+import logging
+import os
+import sys
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver
+from django.utils import formats, translation
+
+logger = logging.getLogger(__name__)
+
+
+def load_urlconf():
+    """Импортирует URLconf и заполняет таблицы reverse()."""
+    resolver = get_resolver()
+    resolver.url_patterns
+    resolver.reverse_dict
+
+
+def compile_templates():
+    """Компилирует все шаблоны из каталога templates/."""
+    for root in settings.TEMPLATES[0]['DIRS']:
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if not filename.endswith('.html'):
+                    continue
+                name = os.path.relpath(os.path.join(dirpath, filename), root)
+                try:
+                    get_template(name.replace(os.sep, '/'))
+                except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                    logger.warning('Шаблон %s не скомпилирован: %s',
+                                   name, error)
+
+
+def load_translations():
+    """Загружает каталог переводов и форматы дат языка по умолчанию."""
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('Password')
+        formats.get_format('DATE_FORMAT')
+
+
+def prime_urls(application):
+    """Прогоняет горячие страницы через WSGI-приложение, заполняя кеши."""
+    host = next(
+        (host for host in settings.ALLOWED_HOSTS if host not in ('*', '')),
+        'localhost'
+    ).lstrip('.')
+    for path in settings.WARMUP_URLS:
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SCRIPT_NAME': '',
+            'SERVER_NAME': host,
+            'SERVER_PORT': '80',
+            'HTTP_HOST': host,
+            'wsgi.input': BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+        response = application(environ, lambda *args: None)
+        response.close()
+
+
+def open_connections():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def warm_up(application):
+    """Прогревает воркер до приёма трафика и логирует время каждого шага.
+
+    Соединения с БД открываются последними: обработка запросов в
+    prime_urls закрывает их по сигналу request_finished.
+    """
+    steps = (
+        ('urlconf', load_urlconf),
+        ('templates', compile_templates),
+        ('translations', load_translations),
+        ('cache', lambda: prime_urls(application)),
+        ('database', open_connections),
+    )
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception('Шаг прогрева %s завершился ошибкой', name)
+        timings[name] = time.perf_counter() - started
+    logger.info(
+        'Прогрев воркера: %s',
+        ', '.join(f'{name} {seconds * 1000:.1f} мс'
+                  for name, seconds in timings.items())
+    )
+    return timings
@@ -0,0 +1,126 @@
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+from django.http import HttpResponse
+
+
+class WriteTimeout(Exception):
+    """Запись не дождалась очереди и отменена: она не выполнится."""
+
+
+class SerialWriter:
+    """Единственный поток, через который проходят записи в БД.
+
+    SQLite допускает одного писателя, поэтому параллельные запросы
+    ловят «database is locked». Здесь записи выстраиваются в очередь,
+    и поток-писатель выполняет до batch_size записей в одной транзакции.
+    Каждая запись идёт в своей точке сохранения, так что ошибка одной
+    не откатывает соседние. Результат становится доступен вызывающему
+    после фиксации транзакции.
+    """
+
+    def __init__(self, batch_size=50):
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def submit(self, func, *args, **kwargs):
+        self.ensure_started()
+        future = Future()
+        self.queue.put((future, func, args, kwargs))
+        return future
+
+    def call(self, timeout, func, *args, **kwargs):
+        """Выполняет запись и ждёт её не дольше timeout секунд.
+
+        Запись, до которой очередь не дошла за это время, отменяется
+        и поднимает WriteTimeout: повтор запроса не создаст дубль.
+        Если писатель уже начал её пачку, ждём фиксации до конца.
+        """
+        future = self.submit(func, *args, **kwargs)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            if future.cancel():
+                raise WriteTimeout from None
+            return future.result()
+
+    def ensure_started(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(
+                    target=self.loop, name='yatube-writer', daemon=True
+                )
+                self.thread.start()
+
+    def loop(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.write(batch)
+
+    def write(self, batch):
+        batch = [item for item in batch
+                 if item[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        outcomes = []
+        try:
+            with transaction.atomic():
+                for future, func, args, kwargs in batch:
+                    try:
+                        with transaction.atomic():
+                            outcomes.append(
+                                (future, func(*args, **kwargs), None)
+                            )
+                    except Exception as error:
+                        outcomes.append((future, None, error))
+        except Exception as error:
+            for future, *_ in batch:
+                future.set_exception(error)
+            return
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+writer = SerialWriter(settings.WRITE_QUEUE_BATCH_SIZE)
+
+
+def write(func, *args, **kwargs):
+    """Выполняет запись через очередь, если WRITE_QUEUE_ENABLED."""
+    if not settings.WRITE_QUEUE_ENABLED:
+        return func(*args, **kwargs)
+    return writer.call(settings.WRITE_QUEUE_TIMEOUT, func, *args, **kwargs)
+
+
+class WriteQueueMiddleware:
+    """Отвечает 503 с Retry-After, если запись отменена по
+    WRITE_QUEUE_TIMEOUT: запрос можно безопасно повторить.
+    """
+
+    def __init__(self, get_response):
+        if not settings.WRITE_QUEUE_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, WriteTimeout):
+            return None
+        response = HttpResponse('Сервер занят, повторите запрос', status=503)
+        response['Retry-After'] = '1'
+        return response
@@ -1,20 +1,90 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.utils import timezone
 
+from core import objects
+from core.admin import CachedChoicesMixin
+from core.paginator import CachedCountPaginator
+
+from . import deletion, group_stats
 from .models import Comment, Follow, Group, Post
 
 
-class PostAdmin(admin.ModelAdmin):
+class PostActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        required=False,
+        label='Группа'
+    )
+
+
+class SoftDeleteMixin:
+    """Удаление из админки только скрывает объекты.
+
+    Зависимые строки стирает purge_deleted, поэтому страница
+    подтверждения не обходит их все, а показывает только выбранные.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(self.opts.verbose_name)
+        objs = list(objs)
+        return (
+            [str(obj) for obj in objs],
+            {self.opts.verbose_name_plural: len(objs)},
+            perms_needed,
+            []
+        )
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, self.model.objects.filter(pk=obj.pk))
+
+
+class PostAdmin(SoftDeleteMixin, CachedChoicesMixin, admin.ModelAdmin):
     list_display = (
         'pk',
         'text',
         'pub_date',
         'author',
         'group',
+        'views',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('group',)
+    action_form = PostActionForm
+    actions = ('move_to_group',)
+    paginator = CachedCountPaginator
+    show_full_result_count = False
+
+    def move_to_group(self, request, queryset):
+        """Переносит выбранные посты в группу одним UPDATE.
+
+        Без выбранной или с несуществующей группой посты не трогает.
+        """
+        try:
+            group = forms.ModelChoiceField(Group.objects.all()).clean(
+                request.POST.get('group')
+            )
+        except forms.ValidationError:
+            self.message_user(request, 'Выберите группу для переноса.',
+                              level=messages.ERROR)
+            return
+        affected = set(queryset.values_list('group_id', flat=True))
+        moved = queryset.update(group=group, modified=timezone.now())
+        objects.invalidate_model(Post)
+        group_stats.refresh(affected | {group.pk})
+        self.message_user(request, f'Перенесено постов: {moved}')
+    move_to_group.short_description = 'Перенести в группу'
+
+    def delete_queryset(self, request, queryset):
+        deletion.soft_delete_posts(queryset)
 
 
 class CommentAdmin(admin.ModelAdmin):
@@ -26,12 +96,34 @@ class CommentAdmin(admin.ModelAdmin):
         'created'
     )
     list_display_links = ('text',)
+    list_select_related = ('post', 'author')
     search_fields = ('text',)
     list_filter = ('created',)
     empty_value_display = '-пусто-'
+    raw_id_fields = ('post', 'author')
+    paginator = CachedCountPaginator
+    show_full_result_count = False
+
+
+class GroupAdmin(SoftDeleteMixin, admin.ModelAdmin):
+    list_display = ('title', 'slug')
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+
+    def delete_queryset(self, request, queryset):
+        deletion.soft_delete_groups(queryset)
+
+
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ('user', 'author', 'digest')
+    list_filter = ('digest',)
+    list_select_related = ('user', 'author')
+    raw_id_fields = ('user', 'author')
+    paginator = CachedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
-admin.site.register(Follow)
+admin.site.register(Follow, FollowAdmin)
@@ -0,0 +1,147 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from sorl.thumbnail import delete as delete_image
+
+from core import objects
+from core.jobs import task
+
+from . import group_stats
+from .models import Comment, Follow, Group, Post, Suggestion, UserDeletion
+
+User = get_user_model()
+
+
+def soft_delete_posts(queryset):
+    """Скрывает посты одним UPDATE и пересчитывает их группы."""
+    group_ids = set(queryset.values_list('group_id', flat=True))
+    queryset.update(is_deleted=True)
+    objects.invalidate_model(Post)
+    group_stats.refresh(group_ids)
+    purge_deleted.delay(unique=True)
+
+
+def mark_deleted(queryset, batch_size):
+    """Помечает строки выборки удалёнными UPDATE-ами по batch_size строк.
+
+    Так у пользователя или группы с тысячами постов ни одно обновление
+    не держит блокировку записи долго.
+    """
+    queryset = queryset.filter(is_deleted=False)
+    total = 0
+    while True:
+        batch = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return total
+        queryset.model.all_objects.filter(pk__in=batch).update(
+            is_deleted=True
+        )
+        total += len(batch)
+
+
+def soft_delete_groups(queryset):
+    group_ids = list(queryset.values_list('pk', flat=True))
+    queryset.update(is_deleted=True)
+    mark_deleted(Post.all_objects.filter(group_id__in=group_ids),
+                 settings.PURGE_BATCH_SIZE)
+    objects.invalidate_model(Group)
+    objects.invalidate_model(Post)
+    purge_deleted.delay(unique=True)
+    cache.delete(group_stats.DIRECTORY_KEY)
+
+
+def soft_delete_user(user):
+    """Блокирует пользователя, скрывает его посты и комментарии
+    и ставит его в очередь на удаление.
+    """
+    user.is_active = False
+    user.save(update_fields=['is_active'])
+    UserDeletion.objects.get_or_create(user=user)
+    group_ids = set(
+        Post.objects.filter(author=user).values_list('group_id', flat=True)
+    )
+    mark_deleted(Post.all_objects.filter(author=user),
+                 settings.PURGE_BATCH_SIZE)
+    mark_deleted(Comment.all_objects.filter(author=user),
+                 settings.PURGE_BATCH_SIZE)
+    objects.invalidate_model(Post)
+    purge_deleted.delay(unique=True)
+    group_stats.refresh(group_ids)
+
+
+def delete_in_batches(queryset, batch_size, sleep):
+    """Удаляет строки выборки порциями по batch_size в отдельных
+    транзакциях, давая другим писателям захватить SQLite между ними.
+    """
+    total = 0
+    while True:
+        batch = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return total
+        with transaction.atomic():
+            queryset.model._base_manager.filter(pk__in=batch).delete()
+        total += len(batch)
+        time.sleep(sleep)
+
+
+def purge_posts(queryset, batch_size, sleep):
+    """Удаляет посты с комментариями, картинками и их миниатюрами."""
+    total = 0
+    while True:
+        batch = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return total
+        delete_in_batches(
+            Comment.all_objects.filter(post_id__in=batch), batch_size, sleep
+        )
+        posts = Post.all_objects.filter(pk__in=batch)
+        images = list(posts.exclude(image='').values_list('image', flat=True))
+        with transaction.atomic():
+            # Агрегаты групп уже пересчитаны при мягком удалении,
+            # drop_group_stats пропускает посты с этим флагом.
+            posts.update(is_deleted=True)
+            posts.delete()
+        for image in images:
+            delete_image(image)
+        total += len(batch)
+        time.sleep(sleep)
+
+
+def purge(batch_size=500, sleep=0.05):
+    """Стирает всё, что было удалено мягко. Возвращает число строк."""
+    counts = {'posts': 0, 'groups': 0, 'users': 0}
+    counts['posts'] += purge_posts(
+        Post.all_objects.filter(is_deleted=True), batch_size, sleep
+    )
+    for group in Group.all_objects.filter(is_deleted=True):
+        counts['posts'] += purge_posts(
+            Post.all_objects.filter(group=group), batch_size, sleep
+        )
+        group.delete()
+        counts['groups'] += 1
+    for deletion in UserDeletion.objects.select_related('user'):
+        user = deletion.user
+        delete_in_batches(
+            Comment.all_objects.filter(author=user), batch_size, sleep
+        )
+        counts['posts'] += purge_posts(
+            Post.all_objects.filter(author=user), batch_size, sleep
+        )
+        for queryset in (
+            Follow.objects.filter(user=user),
+            Follow.objects.filter(author=user),
+            Suggestion.objects.filter(user=user),
+            Suggestion.objects.filter(author=user),
+        ):
+            delete_in_batches(queryset, batch_size, sleep)
+        user.delete()
+        counts['users'] += 1
+    return counts
+
+
+@task
+def purge_deleted():
+    purge(settings.PURGE_BATCH_SIZE, settings.PURGE_SLEEP)
@@ -0,0 +1,78 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from core.jobs import task
+
+from .models import Follow, Post
+
+
+def window(hours, now=None):
+    """Интервал дайджеста, выровненный по началу часа.
+
+    Повторный запуск в тот же час берёт тот же интервал, а соседние
+    запуски стыкуются без пропусков и пересечений.
+    """
+    until = (now or timezone.now()).replace(minute=0, second=0,
+                                            microsecond=0)
+    return until - timedelta(hours=hours), until
+
+
+def recipients(since, until):
+    """Новые посты за интервал по подписчикам с включённым дайджестом.
+
+    Возвращает список пар (подписчик, посты) — два запроса на весь
+    дайджест, сколько бы ни было авторов и получателей.
+    """
+    posts = list(
+        Post.objects.filter(pub_date__gte=since, pub_date__lt=until)
+        .select_related('author').for_list().order_by('pub_date')
+    )
+    by_author = defaultdict(list)
+    for post in posts:
+        by_author[post.author_id].append(post)
+    follows = Follow.objects.filter(
+        digest=True, author_id__in=by_author, user__is_active=True
+    ).exclude(user__email='').select_related('user')
+    grouped = {}
+    for follow in follows:
+        user, posts = grouped.setdefault(follow.user_id, (follow.user, []))
+        posts.extend(by_author[follow.author_id])
+    return [
+        (user, sorted(posts, key=lambda post: post.pub_date))
+        for user, posts in grouped.values()
+    ]
+
+
+def build(user, posts):
+    posts = [
+        (post, settings.SITE_URL + reverse('posts:post_detail',
+                                           args=[post.pk]))
+        for post in posts
+    ]
+    return EmailMessage(
+        subject=f'Новые посты в Yatube: {len(posts)}',
+        body=render_to_string('posts/email/digest.txt', {
+            'user': user,
+            'posts': posts,
+            'follow_url': settings.SITE_URL + reverse('posts:follow_index'),
+        }),
+        to=[user.email],
+    )
+
+
+@task
+def send_digests(hours=None):
+    """Одно письмо на подписчика со всеми новыми постами его авторов.
+
+    Письма уходят одним вызовом send_messages, с OutboxBackend —
+    одной вставкой в очередь. Возвращает число писем.
+    """
+    since, until = window(hours or settings.DIGEST_HOURS)
+    messages = [build(user, posts) for user, posts in recipients(since, until)]
+    return get_connection().send_messages(messages) or 0
@@ -0,0 +1,129 @@
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Follow
+
+
+def following_key(user_id):
+    return f'follow:following:{user_id}'
+
+
+def followers_key(author_id):
+    return f'follow:followers:{author_id}'
+
+
+def count_key(key):
+    return f'{key}:count'
+
+
+def following_queryset(user_id):
+    return Follow.objects.filter(user_id=user_id).values_list(
+        'author_id', flat=True
+    )
+
+
+def followers_queryset(author_id):
+    return Follow.objects.filter(author_id=author_id).values_list(
+        'user_id', flat=True
+    )
+
+
+def load_ids(key, queryset):
+    """Id по возрастанию: страница — срез, проверка — bisect."""
+    ids = cache.get(key)
+    if ids is None:
+        ids = tuple(sorted(queryset))
+        cache.set(key, ids, settings.FOLLOW_GRAPH_TIMEOUT)
+    return ids
+
+
+def load_count(key, queryset):
+    """Число id лежит отдельно, чтобы не читать из кеша весь список.
+
+    При промахе число берётся из уже закешированного списка, если он есть.
+    """
+    count = cache.get(count_key(key))
+    if count is None:
+        ids = cache.get(key)
+        count = queryset.count() if ids is None else len(ids)
+        cache.set(count_key(key), count, settings.FOLLOW_GRAPH_TIMEOUT)
+    return count
+
+
+def following_ids(user_id):
+    """Id авторов, на которых подписан пользователь."""
+    return load_ids(following_key(user_id), following_queryset(user_id))
+
+
+def follower_ids(author_id):
+    """Id подписчиков автора."""
+    return load_ids(followers_key(author_id), followers_queryset(author_id))
+
+
+def following_count(user_id):
+    return load_count(following_key(user_id), following_queryset(user_id))
+
+
+def followers_count(author_id):
+    return load_count(followers_key(author_id),
+                      followers_queryset(author_id))
+
+
+def contains(ids, pk):
+    index = bisect_left(ids, pk)
+    return index < len(ids) and ids[index] == pk
+
+
+def is_following(user, author):
+    return user.is_authenticated and contains(
+        following_ids(user.pk), author.pk
+    )
+
+
+def invalidate(user_id, author_id):
+    """Сбрасывает списки, затронутые подпиской user_id на author_id."""
+    keys = [following_key(user_id), followers_key(author_id)]
+    cache.delete_many(keys + [count_key(key) for key in keys])
+
+
+def follow(user, author):
+    """Подписывает одним INSERT; повторная подписка игнорируется."""
+    Follow.objects.bulk_create(
+        [Follow(user=user, author=author)], ignore_conflicts=True
+    )
+    invalidate(user.pk, author.pk)
+
+
+def unfollow(user, author):
+    """Отписывает одним DELETE без предварительной проверки.
+
+    _raw_delete обходит сигналы post_delete: с ними Django сначала
+    выбирает строки, а кеш сбрасывается здесь же.
+    """
+    queryset = Follow.objects.filter(user=user, author=author)
+    queryset._raw_delete(queryset.db)
+    invalidate(user.pk, author.pk)
+
+
+def set_digest(user, author, enabled):
+    """Включает или выключает дайджест по существующей подписке."""
+    return Follow.objects.filter(user=user, author=author).update(
+        digest=enabled
+    )
+
+
+def keyset_page(ids, after=None, limit=None):
+    """Страница id по убыванию, начиная после курсора after.
+
+    ids отсортированы по возрастанию, поэтому страница — срез перед
+    позицией курсора. Возвращает id страницы и курсор следующей
+    страницы или None.
+    """
+    limit = limit or settings.PAGE_COUNT
+    end = len(ids) if after is None else bisect_left(ids, after)
+    start = max(end - limit, 0)
+    page = list(reversed(ids[start:end]))
+    next_cursor = page[-1] if start > 0 else None
+    return page, next_cursor
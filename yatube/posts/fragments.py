@@ -0,0 +1,95 @@
+import time
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.template import Context
+from django.template.loader import get_template
+from django.urls import NoReverseMatch, get_script_prefix, reverse
+from django.utils.safestring import mark_safe
+
+FRAGMENT_TEMPLATE = 'posts/includes/post_list.html'
+URL_SENTINELS = ('url-sentinel', 987654321)
+URL_SAFE = "!$&'()*+,;=/~:@"
+
+
+@lru_cache(maxsize=None)
+def url_pattern(name, script_prefix):
+    for sentinel in URL_SENTINELS:
+        try:
+            url = reverse(name, args=[sentinel])
+        except NoReverseMatch:
+            continue
+        return url.replace(str(sentinel), '{}')
+    raise NoReverseMatch(name)
+
+
+def build_url(name, value):
+    """Адрес с одним аргументом без reverse() на каждый пост.
+
+    Шаблон адреса вычисляется один раз, значение экранируется так же,
+    как это делает reverse().
+    """
+    return url_pattern(name, get_script_prefix()).format(
+        quote(str(value), safe=URL_SAFE)
+    )
+
+
+def author_stamp_key(author_id):
+    return f'post-fragment:author:{author_id}'
+
+
+def touch_author(author_id):
+    """Обновляет метку автора, инвалидируя фрагменты всех его постов."""
+    cache.set(author_stamp_key(author_id), time.time(), None)
+
+
+def author_stamps(author_ids):
+    keys = {author_stamp_key(author_id): author_id
+            for author_id in author_ids}
+    stamps = {keys[key]: stamp
+              for key, stamp in cache.get_many(keys).items()}
+    missing = {key: time.time() for key, author_id in keys.items()
+               if author_id not in stamps}
+    if missing:
+        cache.set_many(missing, None)
+        stamps.update((keys[key], stamp) for key, stamp in missing.items())
+    return stamps
+
+
+def fragment_key(post, author_stamp):
+    return (f'post-fragment:{post.pk}:'
+            f'{post.modified.timestamp()}:{author_stamp}')
+
+
+def attach_fragments(posts):
+    """Добавляет к постам отрендеренный HTML карточки.
+
+    Все фрагменты страницы читаются из кеша одним get_many,
+    промахи рендерятся одним скомпилированным шаблоном карточки.
+    """
+    posts = list(posts)
+    stamps = author_stamps({post.author_id for post in posts})
+    keys = {fragment_key(post, stamps[post.author_id]): post
+            for post in posts}
+    fragments = cache.get_many(keys)
+    misses = [post for key, post in keys.items() if key not in fragments]
+    prefetch_related_objects(misses, 'author')
+    if misses:
+        card = get_template(FRAGMENT_TEMPLATE).template
+        context = Context()
+    rendered = {}
+    for key, post in keys.items():
+        if key not in fragments:
+            with context.push(
+                post=post,
+                profile_url=build_url('posts:profile', post.author.username),
+                detail_url=build_url('posts:post_detail', post.pk)
+            ):
+                rendered[key] = fragments[key] = card.render(context)
+        post.fragment = mark_safe(fragments[key])
+    if rendered:
+        cache.set_many(rendered, settings.POST_FRAGMENT_TIMEOUT)
+    return posts
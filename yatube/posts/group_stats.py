@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from core import objects
+
+from .models import Group, Post
+
+DIRECTORY_KEY = 'groups:directory'
+
+
+def post_added(post):
+    """Учитывает новый пост без пересчёта всей группы."""
+    Group.objects.filter(pk=post.group_id).update(
+        posts_count=F('posts_count') + 1,
+        last_post_at=post.pub_date,
+        last_post_excerpt=post.excerpt
+    )
+    objects.forget(Group, [post.group_id])
+    cache.delete(DIRECTORY_KEY)
+
+
+def refresh(group_ids):
+    """Пересчитывает агрегаты указанных групп.
+
+    Каждая группа считается по индексу posts_post.group_id, без
+    GROUP BY по всей таблице постов.
+    """
+    group_ids = set(group_ids) - {None}
+    for group_id in group_ids:
+        posts = Post.objects.filter(group_id=group_id)
+        last = posts.order_by('-pub_date').values(
+            'pub_date', 'excerpt'
+        ).first()
+        Group.objects.filter(pk=group_id).update(
+            posts_count=posts.count(),
+            last_post_at=last['pub_date'] if last else None,
+            last_post_excerpt=last['excerpt'] if last else ''
+        )
+    objects.forget(Group, group_ids)
+    cache.delete(DIRECTORY_KEY)
+
+
+def directory():
+    groups = cache.get(DIRECTORY_KEY)
+    if groups is None:
+        groups = list(Group.objects.order_by('title'))
+        cache.set(DIRECTORY_KEY, groups, settings.GROUP_DIRECTORY_TIMEOUT)
+    return groups
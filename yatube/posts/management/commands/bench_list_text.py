@@ -0,0 +1,70 @@
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+def fetched_bytes(queryset):
+    """Сколько байт значений строк вернула база на запрос выборки."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(
+            len(value) if isinstance(value, bytes)
+            else len(str(value).encode())
+            for row in cursor.fetchall()
+            for value in row if value is not None
+        )
+
+
+def materialize(queryset):
+    """Время и пик памяти на создание объектов страницы."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    posts = list(queryset.all())
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(posts), elapsed, peak
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает страницу списка постов из полных строк и из '
+            'for_list() без text и text_html: байты из базы, пик памяти '
+            'и время. Создаёт посты в транзакции и откатывает её по '
+            'окончании.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=500)
+        parser.add_argument('--length', type=int, default=20000,
+                            help='Длина текста поста в символах.')
+
+    def handle(self, *args, posts, length, **options):
+        with transaction.atomic():
+            author, _ = User.objects.get_or_create(username='bench_list')
+            for number in range(posts):
+                Post.objects.create(
+                    author=author,
+                    text=(f'Пост {number}. ' * length)[:length]
+                )
+            page = Post.objects.select_related('group')
+            for name, queryset in (
+                ('полные строки', page),
+                ('for_list()', page.for_list()),
+            ):
+                queryset = queryset[:settings.PAGE_COUNT]
+                size = fetched_bytes(queryset)
+                count, elapsed, peak = materialize(queryset)
+                self.stdout.write(
+                    f'{name}: {count} постов, из базы {size / 1024:.1f} КБ, '
+                    f'пик памяти {peak / 1024:.1f} КБ, '
+                    f'{elapsed * 1000:.2f} мс'
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,83 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import override_settings
+from django.utils import timezone
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+INCLUDE_PER_POST = """
+{% for post in posts %}
+  {% url 'posts:profile' post.author as profile_url %}
+  {% url 'posts:post_detail' post.pk as detail_url %}
+  {% include 'posts/includes/post_list.html' %}
+  {% if post.group %}
+  <a href="{% url 'posts:group_list' post.group.slug %}">все записи группы</a>
+  {% endif %}
+  {% if not forloop.last %}<hr>{% endif %}
+{% endfor %}
+"""
+RENDER_POST_LIST = '{% load post_list %}{% render_post_list posts %}'
+BENCH_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'bench_post_list',
+    }
+}
+
+
+def make_posts(count, now):
+    """Посты в памяти: замер не зависит от базы данных."""
+    group = Group(pk=1, title='Группа', slug='bench')
+    posts = []
+    for number in range(1, count + 1):
+        author = User(pk=number, username=f'bench{number}',
+                      first_name='Лев', last_name='Толстой')
+        posts.append(Post(pk=number, text=f'Пост {number} ' * 20,
+                          author=author, group=group,
+                          pub_date=now, modified=now))
+    return posts
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает рендер страницы из 10 и 50 постов через include '
+            'на каждый пост и через тег render_post_list.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, repeat, **options):
+        engine = engines['django']
+        variants = (
+            ('include на пост', engine.from_string(INCLUDE_PER_POST), True),
+            ('render_post_list, холодный кеш',
+             engine.from_string(RENDER_POST_LIST), True),
+            ('render_post_list, тёплый кеш',
+             engine.from_string(RENDER_POST_LIST), False),
+        )
+        with override_settings(CACHES=BENCH_CACHES):
+            for count in (10, 50):
+                for name, template, cold in variants:
+                    elapsed = self.measure(template, count, repeat, cold)
+                    self.stdout.write(
+                        f'{count} постов, {name}: {elapsed * 1000:.2f} мс'
+                    )
+
+    def measure(self, template, count, repeat, cold):
+        now = timezone.now()
+        cache.clear()
+        template.render({'posts': make_posts(count, now)})
+        total = 0
+        for _ in range(repeat):
+            if cold:
+                cache.clear()
+            posts = make_posts(count, now)
+            started = time.perf_counter()
+            template.render({'posts': posts})
+            total += time.perf_counter() - started
+        return total / repeat
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts.suggestions import compute_suggestions
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рекомендации «кого почитать» по графу подписок '
+            'и недавней активности авторов. Запускается по расписанию.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10,
+                            help='Рекомендаций на пользователя.')
+        parser.add_argument('--days', type=int, default=30,
+                            help='Окно активности авторов в днях.')
+        parser.add_argument('--activity-weight', type=float, default=0.5)
+
+    def handle(self, *args, limit, days, activity_weight, **options):
+        total = compute_suggestions(limit, days, activity_weight)
+        self.stdout.write(f'Сохранено рекомендаций: {total}')
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from posts.deletion import purge
+
+
+class Command(BaseCommand):
+    help = ('Стирает мягко удалённые посты, группы и пользователей '
+            'вместе с зависимыми строками и картинками. Удаляет '
+            'небольшими порциями, чтобы не блокировать базу.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--sleep', type=float, default=0.05,
+            help='Пауза между порциями в секундах.'
+        )
+
+    def handle(self, *args, batch_size, sleep, **options):
+        counts = purge(batch_size, sleep)
+        self.stdout.write(
+            f'Удалено постов: {counts["posts"]}, групп: {counts["groups"]}, '
+            f'пользователей: {counts["users"]}'
+        )
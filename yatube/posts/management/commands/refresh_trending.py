@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.checks import cache_is_shared
+from posts.trending import refresh
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает список популярных постов. Запускается по '
+            'расписанию не реже TRENDING_REFRESH_SECONDS. Счётчики '
+            'лежат в кеше, поэтому нужен кеш, общий с воркерами.')
+
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            raise CommandError(
+                'Кеш по умолчанию свой в каждом процессе: команда не '
+                'увидит счётчики воркеров. Задайте общий кеш.'
+            )
+        self.stdout.write(f'Популярных постов: {len(refresh())}')
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from core.objects import invalidate_model
+from posts import markup
+from posts.models import Comment, Post
+
+
+def render_stale(model, batch_size, everything=False):
+    """Перерисовывает text_html пачками по batch_size записей.
+
+    Упоминания пачки проверяются одним запросом. Возвращает число
+    перерисованных записей.
+    """
+    queryset = model.all_objects.order_by('pk')
+    if not everything:
+        queryset = queryset.exclude(html_version=markup.VERSION)
+    done = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return done
+        usernames = markup.mentioned(row.text for row in batch)
+        for row in batch:
+            row.render_text(usernames)
+        model.all_objects.bulk_update(batch, ['text_html', 'html_version'])
+        done += len(batch)
+        last_pk = batch[-1].pk
+
+
+class Command(BaseCommand):
+    help = ('Перерисовывает HTML постов и комментариев, сохранённый '
+            'прежней версией рендера. Запускается после изменения '
+            'posts.markup.VERSION.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--all', action='store_true',
+                            help='Перерисовать и записи текущей версии.')
+
+    def handle(self, *args, batch_size, **options):
+        for model in (Post, Comment):
+            done = render_stale(model, batch_size, options['all'])
+            if model is Post and done:
+                invalidate_model(Post)
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: перерисовано {done}'
+            )
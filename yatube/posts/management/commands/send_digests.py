@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts.digest import send_digests
+
+
+class Command(BaseCommand):
+    help = ('Ставит в очередь дайджесты новых постов для подписчиков, '
+            'которые их включили. Запускается по расписанию раз в '
+            'DIGEST_HOURS часов.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int,
+                            default=settings.DIGEST_HOURS)
+
+    def handle(self, *args, hours, **options):
+        self.stdout.write(f'Писем: {send_digests(hours)}')
@@ -0,0 +1,71 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.utils.html import escape, urlize
+from django.utils.safestring import mark_safe
+
+from .fragments import build_url
+
+# Увеличивается при любом изменении вывода render: render_texts
+# перерисует всё, что сохранено прежней версией.
+VERSION = 1
+
+TOKEN = re.compile(
+    r'(?<![\w@/#&])@(?P<mention>\w[\w.+-]*\w|\w)'
+    r'|(?<![\w@/#&])#(?P<hashtag>\w+)'
+)
+PARAGRAPH = re.compile(r'\n{2,}')
+
+
+def mentioned(texts):
+    """Существующие пользователи, упомянутые в texts, одним запросом."""
+    names = {
+        match.group('mention')
+        for text in texts for match in TOKEN.finditer(text)
+        if match.group('mention')
+    }
+    if not names:
+        return set()
+    return set(
+        get_user_model().objects.filter(username__in=names, is_active=True)
+        .values_list('username', flat=True)
+    )
+
+
+def render_line(line, usernames):
+    parts = []
+    position = 0
+    for match in TOKEN.finditer(line):
+        parts.append(urlize(line[position:match.start()], nofollow=True,
+                            autoescape=True))
+        mention, hashtag = match.group('mention', 'hashtag')
+        if mention in usernames:
+            parts.append('<a href="{}">@{}</a>'.format(
+                escape(build_url('posts:profile', mention)), escape(mention)
+            ))
+        elif hashtag:
+            parts.append(f'<span class="hashtag">#{escape(hashtag)}</span>')
+        else:
+            parts.append(escape(match.group()))
+        position = match.end()
+    parts.append(urlize(line[position:], nofollow=True, autoescape=True))
+    return ''.join(parts)
+
+
+def render(text, usernames=None):
+    """HTML текста: абзацы, переносы строк, ссылки, @упоминания и #теги.
+
+    Весь текст пользователя экранируется, теги добавляет только
+    рендер. Упоминание становится ссылкой, если такой пользователь
+    есть; usernames позволяет передать их заранее для целой пачки.
+    """
+    if usernames is None:
+        usernames = mentioned([text])
+    text = text.replace('\r\n', '\n').strip()
+    paragraphs = (
+        '<br>'.join(render_line(line, usernames)
+                    for line in paragraph.split('\n'))
+        for paragraph in PARAGRAPH.split(text)
+    )
+    return mark_safe(''.join(f'<p>{paragraph}</p>'
+                             for paragraph in paragraphs))
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:17
+
+from django.db import migrations, models
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    for group in Group.objects.all():
+        posts = Post.objects.filter(group=group)
+        last = posts.order_by('-pub_date').first()
+        group.posts_count = posts.count()
+        group.last_post_at = last and last.pub_date
+        group.last_post_excerpt = last.text[:200] if last else ''
+        group.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_suggestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Последний пост'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_post_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='Начало последнего поста'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число постов'),
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0014_group_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDeletion',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='deletion', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('requested', models.DateTimeField(auto_now_add=True, verbose_name='Запрошено')),
+            ],
+            options={
+                'verbose_name': 'Удаление пользователя',
+                'verbose_name_plural': 'Удаления пользователей',
+            },
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Удалена'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Удалён'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_post_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='follow',
+            name='digest',
+            field=models.BooleanField(default=False, verbose_name='Дайджест на почту'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:38
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = []
+    for post in Post.objects.only('text').iterator():
+        post.excerpt = Truncator(post.text).chars(300)
+        post.text_length = len(post.text)
+        posts.append(post)
+        if len(posts) == 500:
+            Post.objects.bulk_update(posts, ['excerpt', 'text_length'])
+            posts = []
+    Post.objects.bulk_update(posts, ['excerpt', 'text_length'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_follow_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Начало текста'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_length',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Длина текста'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
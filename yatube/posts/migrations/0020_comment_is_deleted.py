@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:53
+
+from django.db import migrations, models
+
+
+def mark_hidden(apps, schema_editor):
+    """Помечает то, что раньше скрывали JOIN-ы менеджеров."""
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    UserDeletion = apps.get_model('posts', 'UserDeletion')
+    users = UserDeletion.objects.values('user_id')
+    Post.objects.filter(
+        models.Q(group__is_deleted=True) | models.Q(author__in=users)
+    ).update(is_deleted=True)
+    Comment.objects.filter(author__in=users).update(is_deleted=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_rendered_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='is_deleted',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Удалён'),
+        ),
+        migrations.RunPython(mark_hidden, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 08:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_comment_is_deleted'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='group',
+            name='last_post_excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Начало последнего поста'),
+        ),
+    ]
@@ -1,8 +1,98 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.safestring import mark_safe
+from django.utils.text import Truncator
+
+from . import markup
 
 User = get_user_model()
 
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(text):
+    return Truncator(text).chars(EXCERPT_LENGTH)
+
+
+def saves_text(instance, update_fields):
+    """Сохранение записывает text, и text загружен."""
+    return 'text' not in instance.get_deferred_fields() and (
+        update_fields is None or 'text' in update_fields
+    )
+
+
+class RenderedTextModel(models.Model):
+    """Хранит text, отрендеренный posts.markup при сохранении.
+
+    Шаблоны выводят готовый html и не прогоняют текст через фильтры
+    на каждом показе.
+    """
+
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML'
+    )
+    html_version = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия рендера'
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if saves_text(self, update_fields):
+            self.render_text()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'text_html', 'html_version'
+                }
+        super().save(*args, **kwargs)
+
+    def render_text(self, usernames=None):
+        self.text_html = markup.render(self.text, usernames)
+        self.html_version = markup.VERSION
+
+    @property
+    def html(self):
+        """Сохранённый HTML; запись старой версии рендерится на лету,
+        пока её не перерисует render_texts. На лету упоминания не
+        проверяются по базе и остаются текстом: иначе каждый пост
+        и комментарий страницы стоил бы запроса.
+        """
+        if self.html_version != markup.VERSION:
+            return markup.render(self.text, usernames=set())
+        return mark_safe(self.text_html)
+
+
+class GroupManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class PostQuerySet(models.QuerySet):
+    def for_list(self):
+        """Без text и text_html: спискам хватает excerpt."""
+        return self.defer('text', 'text_html')
+
+
+class PostManager(models.Manager.from_queryset(PostQuerySet)):
+    """Скрывает посты, помеченные удалёнными, до того, как их сотрёт
+    purge_deleted. Посты удалённых групп и пользователей помечает
+    posts.deletion, так что фильтр не требует JOIN.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+class CommentManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
 
 class Group(models.Model):
     title = models.CharField(max_length=200,
@@ -11,6 +101,30 @@ class Group(models.Model):
                              )
     slug = models.SlugField(max_length=200, unique=True, verbose_name='Слаг')
     description = models.TextField(verbose_name='Описание')
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число постов'
+    )
+    last_post_at = models.DateTimeField(
+        blank=True, null=True,
+        editable=False,
+        verbose_name='Последний пост'
+    )
+    last_post_excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало последнего поста'
+    )
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Удалена'
+    )
+
+    objects = GroupManager()
+    all_objects = models.Manager()
 
     class Meta:
         verbose_name = 'Группа'
@@ -20,7 +134,7 @@ class Group(models.Model):
         return self.title
 
 
-class Post(models.Model):
+class Post(RenderedTextModel):
     text = models.TextField(verbose_name='Текст',
                             help_text="Текст нового поста",
                             )
@@ -28,6 +142,9 @@ class Post(models.Model):
                                     verbose_name='Дата публикации',
                                     db_index=True
                                     )
+    modified = models.DateTimeField(auto_now=True,
+                                    verbose_name='Дата изменения'
+                                    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -48,6 +165,30 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    views = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотры'
+    )
+    excerpt = models.CharField(
+        max_length=EXCERPT_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Начало текста'
+    )
+    text_length = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Длина текста'
+    )
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Удалён'
+    )
+
+    objects = PostManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['-pub_date']
@@ -57,8 +198,28 @@ class Post(models.Model):
     def __str__(self):
         return self.text[:15]
 
+    def save(self, *args, **kwargs):
+        """Пересчитывает excerpt и text_length вместе с текстом.
+
+        Списки постов читают только их и не загружают text.
+        """
+        update_fields = kwargs.get('update_fields')
+        if saves_text(self, update_fields):
+            self.excerpt = make_excerpt(self.text)
+            self.text_length = len(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'excerpt', 'text_length'
+                }
+        super().save(*args, **kwargs)
+
+    @property
+    def has_more(self):
+        """В excerpt поместился не весь текст."""
+        return self.text_length > len(self.excerpt)
 
-class Comment(models.Model):
+
+class Comment(RenderedTextModel):
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -79,6 +240,14 @@ class Comment(models.Model):
     created = models.DateTimeField(auto_now_add=True,
                                    verbose_name='Дата публикации'
                                    )
+    is_deleted = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Удалён'
+    )
+
+    objects = CommentManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ['-created']
@@ -99,6 +268,10 @@ class Follow(models.Model):
         related_name='following',
         verbose_name='Автор'
     )
+    digest = models.BooleanField(
+        default=False,
+        verbose_name='Дайджест на почту'
+    )
 
     class Meta:
         verbose_name = 'Подписка'
@@ -112,3 +285,52 @@ class Follow(models.Model):
         return (f'Пользователь {self.user} '
                 f'подписан на пользователя {self.author}'
                 )
+
+
+class Suggestion(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='suggestions',
+        verbose_name='Пользователь'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор'
+    )
+    score = models.FloatField(verbose_name='Рейтинг')
+
+    class Meta:
+        ordering = ['-score']
+        verbose_name = 'Рекомендация'
+        verbose_name_plural = 'Рекомендации'
+        constraints = [models.UniqueConstraint(
+            fields=['user', 'author'],
+            name='unique_suggestion'
+        )]
+
+    def __str__(self):
+        return f'{self.user} → {self.author} ({self.score:.2f})'
+
+
+class UserDeletion(models.Model):
+    """Пользователь, которого purge_deleted сотрёт вместе с его данными."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='deletion',
+        verbose_name='Пользователь'
+    )
+    requested = models.DateTimeField(auto_now_add=True,
+                                     verbose_name='Запрошено'
+                                     )
+
+    class Meta:
+        verbose_name = 'Удаление пользователя'
+        verbose_name_plural = 'Удаления пользователей'
+
+    def __str__(self):
+        return str(self.user)
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from core import objects
+
+from . import follow_graph, group_stats, trending
+from .fragments import touch_author
+from .models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+objects.register(Post)
+objects.register(Group, 'slug')
+objects.register(User, 'username')
+
+
+@receiver(post_save, sender=User)
+def refresh_author_fragments(sender, instance, update_fields=None,
+                             **kwargs):
+    """Имя и ссылка на автора входят в карточки его постов."""
+    if update_fields == {'last_login'}:
+        return
+    touch_author(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def reset_follow_lists(sender, instance, created, **kwargs):
+    """Новый пользователь не должен унаследовать чужие списки по id."""
+    if created:
+        follow_graph.invalidate(instance.pk, instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def refresh_follow_lists(sender, instance, **kwargs):
+    follow_graph.invalidate(instance.user_id, instance.author_id)
+
+
+@receiver(post_init, sender=Post)
+def remember_group(sender, instance, **kwargs):
+    instance._stats_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def update_group_stats(sender, instance, created, **kwargs):
+    if created:
+        if instance.group_id:
+            group_stats.post_added(instance)
+    else:
+        group_stats.refresh({instance._stats_group_id, instance.group_id})
+    instance._stats_group_id = instance.group_id
+
+
+@receiver(post_delete, sender=Post)
+def drop_group_stats(sender, instance, **kwargs):
+    if not instance.is_deleted:
+        group_stats.refresh({instance.group_id})
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def reset_group_directory(sender, **kwargs):
+    cache.delete(group_stats.DIRECTORY_KEY)
+
+
+@receiver(post_save, sender=Comment)
+def count_trending_comment(sender, instance, created, **kwargs):
+    if created:
+        trending.record('comments', instance.post_id)
@@ -0,0 +1,62 @@
+import math
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Follow, Post, Suggestion
+
+
+def load_graph():
+    following = defaultdict(set)
+    pairs = Follow.objects.values_list('user_id', 'author_id')
+    for user_id, author_id in pairs.iterator():
+        following[user_id].add(author_id)
+    return following
+
+
+def recent_activity(days):
+    since = timezone.now() - timedelta(days=days)
+    return dict(
+        Post.objects.filter(pub_date__gte=since)
+        .values_list('author_id')
+        .annotate(posts=Count('id'))
+        .order_by()
+    )
+
+
+def rank_candidates(user_id, following, activity, activity_weight):
+    """Авторы, на которых подписаны авторы пользователя.
+
+    Рейтинг — число общих подписок плюс логарифм недавней активности.
+    """
+    authors = following[user_id]
+    overlap = Counter()
+    for author_id in authors:
+        overlap.update(following.get(author_id, ()))
+    for candidate in overlap.keys() - authors - {user_id}:
+        yield candidate, (
+            overlap[candidate]
+            + activity_weight * math.log1p(activity.get(candidate, 0))
+        )
+
+
+def compute_suggestions(limit=10, days=30, activity_weight=0.5):
+    following = load_graph()
+    activity = recent_activity(days)
+    suggestions = []
+    for user_id in list(following):
+        ranked = sorted(
+            rank_candidates(user_id, following, activity, activity_weight),
+            key=lambda item: item[1], reverse=True
+        )
+        suggestions.extend(
+            Suggestion(user_id=user_id, author_id=author_id, score=score)
+            for author_id, score in ranked[:limit]
+        )
+    with transaction.atomic():
+        Suggestion.objects.all().delete()
+        Suggestion.objects.bulk_create(suggestions, batch_size=500)
+    return len(suggestions)
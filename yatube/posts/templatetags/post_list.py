@@ -0,0 +1,27 @@
+from django import template
+from django.template.loader import get_template
+
+from ..fragments import attach_fragments, build_url
+
+register = template.Library()
+
+LIST_TEMPLATE = 'posts/includes/post_list_page.html'
+
+
+@register.simple_tag
+def render_post_list(posts):
+    """Рендерит страницу постов за один проход одного шаблона.
+
+    Карточки берутся из кеша фрагментов, адреса групп собираются
+    без тега url на каждый пост.
+    """
+    posts = list(posts)
+    if not all(hasattr(post, 'fragment') for post in posts):
+        posts = attach_fragments(posts)
+    entries = [
+        (post.fragment,
+         build_url('posts:group_list', post.group.slug)
+         if post.group_id else None)
+        for post in posts
+    ]
+    return get_template(LIST_TEMPLATE).render({'entries': entries})
@@ -0,0 +1,85 @@
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class PostAdminTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@yatube.ru', password='admin'
+        )
+        cls.group = Group.objects.create(
+            title='Старая группа', slug='old', description='Описание'
+        )
+        cls.new_group = Group.objects.create(
+            title='Новая группа', slug='new', description='Описание'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def create_posts(self, count):
+        for number in range(count):
+            post = Post.objects.create(
+                text=f'Пост {number}', author=self.admin, group=self.group
+            )
+            Comment.objects.create(post=post, author=self.admin, text='Ок')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelists_do_not_query_per_row(self):
+        """Число запросов changelist не зависит от числа строк."""
+        for model in ('post', 'comment'):
+            with self.subTest(model=model):
+                url = reverse(f'admin:posts_{model}_changelist')
+                Post.objects.all().delete()
+                self.create_posts(2)
+                self.client.get(url)
+                few = self.count_queries(url)
+                self.create_posts(8)
+                self.assertEqual(self.count_queries(url), few)
+
+    def test_move_to_group_action(self):
+        """Действие переносит выбранные посты в другую группу."""
+        self.create_posts(3)
+        selected = list(Post.objects.values_list('pk', flat=True)[:2])
+        self.client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'move_to_group',
+            'group': self.new_group.pk,
+            helpers.ACTION_CHECKBOX_NAME: selected,
+        })
+        self.assertEqual(self.new_group.posts.count(), 2)
+        self.assertEqual(self.group.posts.count(), 1)
+
+    def test_move_to_group_needs_group(self):
+        """Без группы или с чужим id действие ничего не меняет."""
+        self.create_posts(2)
+        selected = list(Post.objects.values_list('pk', flat=True))
+        for group in ('', '999', 'abc'):
+            with self.subTest(group=group):
+                response = self.client.post(
+                    reverse('admin:posts_post_changelist'), {
+                        'action': 'move_to_group',
+                        'group': group,
+                        helpers.ACTION_CHECKBOX_NAME: selected,
+                    }, follow=True
+                )
+                self.assertEqual(self.group.posts.count(), 2)
+                if not group:
+                    self.assertContains(response,
+                                        'Выберите группу для переноса.')
@@ -0,0 +1,107 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from ..deletion import (purge, soft_delete_groups, soft_delete_posts,
+                        soft_delete_user)
+from ..models import Comment, Follow, Group, Post, UserDeletion
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x01\x00\x01\x00\x00\x00\x00\x21\xf9\x04'
+    b'\x01\x0a\x00\x01\x00\x2c\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02'
+    b'\x02\x4c\x01\x00\x3b'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class DeletionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            text='Пост', author=self.author, group=self.group,
+            image=SimpleUploadedFile('small.gif', SMALL_GIF, 'image/gif')
+        )
+        Comment.objects.create(post=self.post, author=self.reader, text='Ок')
+
+    def test_soft_deleted_post_is_hidden_then_purged(self):
+        """Пост скрыт сразу, а строки и картинка стираются при purge."""
+        path = self.post.image.path
+        soft_delete_posts(Post.objects.filter(pk=self.post.pk))
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(Group.objects.get().posts_count, 0)
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(purge(batch_size=1, sleep=0)['posts'], 1)
+        self.assertFalse(Post.all_objects.exists())
+        self.assertFalse(Comment.all_objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_soft_deleted_group_hides_its_posts(self):
+        soft_delete_groups(Group.objects.filter(pk=self.group.pk))
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(purge(sleep=0), {'posts': 1, 'groups': 1,
+                                          'users': 0})
+        self.assertFalse(Group.all_objects.exists())
+
+    def test_soft_deleted_user_is_purged_with_dependents(self):
+        """Посты и комментарии пользователя скрыты, пока ждут purge."""
+        Follow.objects.create(user=self.reader, author=self.author)
+        Post.objects.create(text='Второй', author=self.reader)
+        soft_delete_user(self.reader)
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(Post.objects.get(), self.post)
+        self.assertEqual(purge(batch_size=1, sleep=0),
+                         {'posts': 1, 'groups': 0, 'users': 1})
+        self.assertFalse(User.objects.filter(username='reader').exists())
+        self.assertFalse(Follow.objects.exists())
+        self.assertFalse(UserDeletion.objects.exists())
+        self.assertEqual(Post.objects.get(), self.post)
+
+    def test_managers_filter_one_column(self):
+        """Менеджеры не присоединяют пользователей и группы, а просто
+        заблокированный автор не скрывает своих постов.
+        """
+        self.assertNotIn('JOIN', str(Post.objects.all().query))
+        self.assertNotIn('JOIN', str(Comment.objects.all().query))
+        self.author.is_active = False
+        self.author.save()
+        self.assertEqual(Post.objects.get(), self.post)
+
+    def test_admin_delete_is_soft(self):
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@yatube.ru', password='admin'
+        )
+        client = Client()
+        client.force_login(admin)
+        client.post(
+            reverse('admin:posts_post_delete', args=[self.post.pk]),
+            {'post': 'yes'}
+        )
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(Post.all_objects.filter(is_deleted=True).exists())
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import digest
+from ..models import Follow, Post
+
+User = get_user_model()
+
+
+class DigestTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader = User.objects.create_user(
+            username='reader', email='reader@example.com'
+        )
+        cls.silent = User.objects.create_user(username='silent')
+        cls.first = User.objects.create_user(username='first')
+        cls.second = User.objects.create_user(username='second')
+        cls.muted = User.objects.create_user(username='muted')
+        Follow.objects.create(user=cls.reader, author=cls.first, digest=True)
+        Follow.objects.create(user=cls.reader, author=cls.second, digest=True)
+        Follow.objects.create(user=cls.reader, author=cls.muted)
+        Follow.objects.create(user=cls.silent, author=cls.first, digest=True)
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for author in (cls.first, cls.second, cls.muted, cls.first):
+            post = Post.objects.create(text=f'Пост {author}', author=author)
+            Post.objects.filter(pk=post.pk).update(pub_date=an_hour_ago)
+        Post.objects.create(text='Старый', author=cls.first)
+        Post.objects.filter(text='Старый').update(
+            pub_date=an_hour_ago - timedelta(days=2)
+        )
+
+    def test_one_mail_per_recipient(self):
+        """Посты всех авторов подписчика собраны в одно письмо."""
+        since, until = digest.window(24, timezone.now() + timedelta(hours=1))
+        with self.assertNumQueries(2):
+            grouped = digest.recipients(since, until)
+        self.assertEqual(len(grouped), 1)
+        user, posts = grouped[0]
+        self.assertEqual(user, self.reader)
+        self.assertEqual(
+            sorted(post.author.username for post in posts),
+            ['first', 'first', 'second']
+        )
+
+    def test_send_digests(self):
+        self.assertEqual(digest.send_digests(), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['reader@example.com'])
+        self.assertIn('Пост second', message.body)
+        self.assertNotIn('Пост muted', message.body)
+        self.assertNotIn('Старый', message.body)
+
+    def test_window_is_aligned_to_hours(self):
+        now = timezone.now().replace(hour=10, minute=37)
+        since, until = digest.window(24, now)
+        self.assertEqual(until, now.replace(minute=0, second=0,
+                                            microsecond=0))
+        self.assertEqual(until - since, timedelta(hours=24))
+
+    def test_toggle_digest(self):
+        client = Client()
+        client.force_login(self.reader)
+        url = reverse('posts:profile_digest', args=[self.muted.username])
+        self.assertEqual(client.get(url).status_code, 405)
+        response = client.post(url, {'digest': '1'})
+        self.assertRedirects(
+            response, reverse('posts:profile', args=[self.muted.username])
+        )
+        self.assertTrue(
+            Follow.objects.get(user=self.reader, author=self.muted).digest
+        )
+        response = client.get(
+            reverse('posts:profile', args=[self.muted.username])
+        )
+        self.assertContains(response, 'Отключить дайджест')
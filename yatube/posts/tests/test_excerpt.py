@@ -0,0 +1,49 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import EXCERPT_LENGTH, Post
+
+User = get_user_model()
+
+
+class ExcerptTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='excerpt')
+        cls.long = Post.objects.create(
+            author=cls.author, text='слово ' * 100 + 'хвост'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_excerpt_follows_text(self):
+        post = Post.objects.get(pk=self.long.pk)
+        self.assertEqual(len(post.excerpt), EXCERPT_LENGTH)
+        self.assertEqual(post.text_length, len(post.text))
+        self.assertTrue(post.has_more)
+        post.text = 'Короткий'
+        post.save(update_fields=['text'])
+        post = Post.objects.get(pk=self.long.pk)
+        self.assertEqual((post.excerpt, post.text_length), ('Короткий', 8))
+        self.assertFalse(post.has_more)
+
+    def test_lists_do_not_load_text(self):
+        """Списки выводят начало текста со ссылкой на пост."""
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotIn('хвост', response.content.decode())
+        self.assertContains(response, 'читать дальше')
+        post = response.context['page_obj'][0]
+        self.assertEqual(post.get_deferred_fields(), {'text', 'text_html'})
+
+    def test_bench_list_text(self):
+        out = StringIO()
+        call_command('bench_list_text', posts=12, length=1000, stdout=out)
+        self.assertIn('for_list()', out.getvalue())
+        self.assertEqual(Post.objects.count(), 1)
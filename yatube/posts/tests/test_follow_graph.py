@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import follow_graph
+from ..models import Follow
+
+User = get_user_model()
+
+
+@override_settings(PAGE_COUNT=2)
+class FollowGraphTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='graph_author')
+        cls.followers = [
+            User.objects.create_user(username=f'graph_follower_{number}')
+            for number in range(3)
+        ]
+        for follower in cls.followers:
+            Follow.objects.create(user=follower, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_followers_keyset_pages(self):
+        """Подписчики выдаются страницами по курсору after."""
+        response = self.client.get(
+            reverse('posts:api_followers', args=[self.author.username])
+        )
+        data = response.json()
+        self.assertEqual(
+            [user['username'] for user in data['results']],
+            ['graph_follower_2', 'graph_follower_1']
+        )
+        response = self.client.get(
+            reverse('posts:api_followers', args=[self.author.username]),
+            {'after': data['next']}
+        )
+        data = response.json()
+        self.assertEqual(
+            [user['username'] for user in data['results']],
+            ['graph_follower_0']
+        )
+        self.assertIsNone(data['next'])
+
+    def test_following_page(self):
+        """Страница подписок показывает авторов пользователя."""
+        response = self.client.get(
+            reverse('posts:following', args=[self.followers[0].username])
+        )
+        self.assertEqual(response.context['users'], [self.author])
+
+    def test_is_following_served_from_cache(self):
+        """Проверка подписки после прогрева не обращается к БД."""
+        follower = self.followers[0]
+        follow_graph.following_ids(follower.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(follow_graph.is_following(follower, self.author))
+
+    def test_unfollow_updates_lists(self):
+        """Отписка сразу отражается в списках."""
+        follower = self.followers[0]
+        follow_graph.following_ids(follower.pk)
+        follow_graph.follower_ids(self.author.pk)
+        Follow.objects.filter(user=follower, author=self.author).delete()
+        self.assertFalse(follow_graph.is_following(follower, self.author))
+        self.assertNotIn(
+            follower.pk, follow_graph.follower_ids(self.author.pk)
+        )
+
+    def test_profile_shows_counts(self):
+        """Профиль показывает число подписчиков и подписок."""
+        client = Client()
+        client.force_login(self.followers[0])
+        response = client.get(
+            reverse('posts:profile', args=[self.author.username])
+        )
+        self.assertEqual(response.context['followers_count'], 3)
+        self.assertTrue(response.context['following'])
+
+    def test_counts_cached_apart_from_ids(self):
+        """Число подписчиков не требует списка id и сбрасывается
+        вместе с ним.
+        """
+        self.assertEqual(follow_graph.followers_count(self.author.pk), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(follow_graph.followers_count(self.author.pk), 3)
+        self.assertIsNone(
+            cache.get(follow_graph.followers_key(self.author.pk))
+        )
+        follow_graph.unfollow(self.followers[0], self.author)
+        self.assertEqual(follow_graph.followers_count(self.author.pk), 2)
+
+    def test_keyset_page_is_slice(self):
+        ids = (1, 3, 5, 7, 9)
+        self.assertEqual(follow_graph.keyset_page(ids, limit=2), ([9, 7], 7))
+        self.assertEqual(follow_graph.keyset_page(ids, after=7, limit=2),
+                         ([5, 3], 3))
+        self.assertEqual(follow_graph.keyset_page(ids, after=3, limit=2),
+                         ([1], None))
+        self.assertEqual(follow_graph.keyset_page(ids, after=4, limit=2),
+                         ([3, 1], None))
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..fragments import attach_fragments
+from ..models import Post
+
+User = get_user_model()
+
+
+class PostFragmentsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='fragments', first_name='Лев', last_name='Толстой'
+        )
+        for number in range(3):
+            Post.objects.create(text=f'Текст {number}', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fragments_rendered_once(self):
+        """Повторная выдача страницы берёт карточки из кеша."""
+        attach_fragments(Post.objects.all())
+        posts = list(Post.objects.all())
+        with self.assertNumQueries(0):
+            posts = attach_fragments(posts)
+        self.assertIn('Текст 2', posts[0].fragment)
+
+    def test_warm_index_skips_posts(self):
+        """Пока блок index_page в кеше, страница не выбирает посты
+        и не собирает их карточки: остаётся только COUNT пагинатора.
+        """
+        self.client.get(reverse('posts:index'))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Текст 2')
+
+    def test_post_edit_invalidates_fragment(self):
+        """Изменение поста меняет ключ его карточки."""
+        attach_fragments(Post.objects.all())
+        post = Post.objects.first()
+        post.text = 'Исправленный текст'
+        post.save()
+        posts = attach_fragments(Post.objects.all())
+        self.assertIn('Исправленный текст', posts[0].fragment)
+
+    def test_author_change_invalidates_fragments(self):
+        """Изменение автора перерисовывает карточки его постов."""
+        attach_fragments(Post.objects.all())
+        self.author.first_name = 'Алексей'
+        self.author.save()
+        for post in attach_fragments(Post.objects.all()):
+            self.assertIn('Алексей Толстой', post.fragment)
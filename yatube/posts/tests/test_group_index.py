@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class GroupIndexTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='groups')
+        cls.cats = Group.objects.create(
+            title='Коты', slug='cats', description='Про котов'
+        )
+        cls.dogs = Group.objects.create(
+            title='Собаки', slug='dogs', description='Про собак'
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_groups(self):
+        response = self.client.get(reverse('posts:group_index'))
+        return {group.slug: group for group in response.context['groups']}
+
+    def test_stats_follow_new_posts(self):
+        """Новый пост сразу виден в каталоге групп."""
+        self.get_groups()
+        Post.objects.create(text='Первый', author=self.author, group=self.cats)
+        Post.objects.create(text='Второй', author=self.author, group=self.cats)
+        groups = self.get_groups()
+        self.assertEqual(groups['cats'].posts_count, 2)
+        self.assertEqual(groups['cats'].last_post_excerpt, 'Второй')
+        self.assertEqual(groups['dogs'].posts_count, 0)
+
+    def test_stats_follow_moves_and_deletes(self):
+        """Перенос и удаление постов пересчитывают обе группы."""
+        post = Post.objects.create(
+            text='Пост', author=self.author, group=self.cats
+        )
+        self.get_groups()
+        post.group = self.dogs
+        post.save()
+        groups = self.get_groups()
+        self.assertEqual(groups['cats'].posts_count, 0)
+        self.assertIsNone(groups['cats'].last_post_at)
+        self.assertEqual(groups['dogs'].posts_count, 1)
+        post.delete()
+        self.assertEqual(self.get_groups()['dogs'].posts_count, 0)
+
+    def test_directory_cached(self):
+        """Повторный показ каталога не обращается к таблице групп."""
+        self.get_groups()
+        with self.assertNumQueries(0):
+            self.get_groups()
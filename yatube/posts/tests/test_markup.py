@@ -0,0 +1,75 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import markup
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+class MarkupTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='leo')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_render(self):
+        html = markup.render(
+            'Привет, @leo и @nobody!\n'
+            'Смотри https://example.com/#top #новости\n\n'
+            '<script>alert(1)</script> mail@example.com'
+        )
+        self.assertEqual(html.count('<p>'), 2)
+        self.assertIn('<br>', html)
+        self.assertIn('<a href="/profile/leo/">@leo</a>', html)
+        self.assertIn('@nobody', html)
+        self.assertNotIn('/profile/nobody/', html)
+        self.assertIn('href="https://example.com/#top" rel="nofollow"', html)
+        self.assertIn('<span class="hashtag">#новости</span>', html)
+        self.assertIn('&lt;script&gt;', html)
+        self.assertNotIn('<script>', html)
+        self.assertIn('mailto:mail@example.com', html)
+
+    def test_html_is_stored_on_save(self):
+        post = Post.objects.create(author=self.author, text='Для @leo')
+        comment = Comment.objects.create(
+            post=post, author=self.author, text='#ответ'
+        )
+        post.text = 'Первая\nвторая'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        comment.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>Первая<br>вторая</p>')
+        self.assertEqual(post.html_version, markup.VERSION)
+        self.assertIn('class="hashtag"', comment.text_html)
+        response = self.client.get(
+            reverse('posts:post_detail', args=[post.pk])
+        )
+        self.assertContains(response, '<p>Первая<br>вторая</p>', html=True)
+        self.assertContains(response, '<span class="hashtag">#ответ</span>',
+                            html=True)
+
+    def test_render_texts_updates_stale_rows(self):
+        post = Post.objects.create(author=self.author, text='@leo')
+        Comment.objects.create(post=post, author=self.author, text='Текст')
+        Post.objects.update(text_html='', html_version=0)
+        Comment.objects.update(text_html='', html_version=0)
+        stale = Post.objects.get()
+        with self.assertNumQueries(0):
+            html = stale.html
+        self.assertEqual(html, '<p>@leo</p>')
+        out = StringIO()
+        with self.assertNumQueries(7):
+            call_command('render_texts', batch_size=1, stdout=out)
+        post.refresh_from_db()
+        self.assertIn('/profile/leo/', post.text_html)
+        self.assertEqual(Comment.objects.get().text_html, '<p>Текст</p>')
+        self.assertIn('перерисовано 1', out.getvalue())
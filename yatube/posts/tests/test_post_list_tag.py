@@ -0,0 +1,54 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.template import engines
+from django.test import TestCase
+from django.urls import reverse
+
+from ..fragments import build_url
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class RenderPostListTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='lev.tolstoy+1@ya')
+        cls.group = Group.objects.create(
+            title='Классика', slug='classic', description='Описание'
+        )
+        cls.grouped = Post.objects.create(
+            text='В группе', author=cls.author, group=cls.group
+        )
+        cls.single = Post.objects.create(text='Без группы', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_build_url_matches_reverse(self):
+        for name, value in (('posts:profile', self.author.username),
+                            ('posts:post_detail', self.grouped.pk),
+                            ('posts:group_list', self.group.slug)):
+            with self.subTest(name=name):
+                self.assertEqual(build_url(name, value),
+                                 reverse(name, args=[value]))
+
+    def test_renders_cards_and_group_links(self):
+        html = engines['django'].from_string(
+            '{% load post_list %}{% render_post_list posts %}'
+        ).render({'posts': Post.objects.select_related('group')})
+        self.assertIn('В группе', html)
+        self.assertIn('Без группы', html)
+        self.assertEqual(html.count('все записи группы'), 1)
+        self.assertEqual(html.count('<hr>'), 1)
+        self.assertIn(reverse('posts:post_detail', args=[self.single.pk]),
+                      html)
+        self.assertIn(reverse('posts:group_list', args=['classic']), html)
+
+    def test_profile_uses_tag(self):
+        response = self.client.get(
+            reverse('posts:profile', args=[self.author.username])
+        )
+        self.assertContains(response, 'подробная информация', count=2)
+        self.assertContains(response, 'все записи группы', count=1)
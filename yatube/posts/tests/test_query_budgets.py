@@ -0,0 +1,133 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from sorl.thumbnail import get_thumbnail
+
+from .. import trending
+from ..models import Comment, Follow, Group, Post
+from ..urls import urlpatterns
+
+User = get_user_model()
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(QUERY_BUDGET_MODE='raise', MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class QueryBudgetTest(TestCase):
+    """Каждый URL укладывается в бюджет своей view на холодном кеше.
+
+    Бюджет не зависит от числа строк на странице: запрос на каждую
+    строку его превысит. Хранилище миниатюр sorl прогрето: первая
+    выдача каждой картинки пишет её в thumbnail_kvstore.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='author')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        Follow.objects.create(user=cls.author, author=cls.reader)
+        for number in range(12):
+            cls.post = Post.objects.create(
+                text=f'Пост {number}', author=cls.author, group=cls.group,
+                image=SimpleUploadedFile(
+                    name='small.gif', content=SMALL_GIF,
+                    content_type='image/gif'
+                )
+            )
+            Comment.objects.create(
+                post=cls.post,
+                author=(cls.author, cls.reader)[number % 2],
+                text=f'Комментарий {number}'
+            )
+        for number in range(3):
+            Comment.objects.create(
+                post=cls.post, author=cls.reader, text='Ещё комментарий'
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.author)
+
+    def url_args(self, name):
+        if name == 'group_list':
+            return [self.group.slug]
+        if name in ('post_detail', 'post_edit', 'add_comment'):
+            return [self.post.pk]
+        if name in ('profile_follow', 'profile_unfollow', 'profile_digest'):
+            return [self.reader.username]
+        if name in ('profile', 'followers', 'following',
+                    'api_followers', 'api_following'):
+            return [self.author.username]
+        return []
+
+    # Ответ на GET, если это не 200.
+    GET_STATUSES = {
+        'add_comment': 302,
+        'profile_follow': 302,
+        'profile_unfollow': 302,
+        'profile_digest': 405,
+    }
+
+    def post_cases(self):
+        """Запись через POST для view, которые её принимают."""
+        return {
+            'post_create': {'text': 'Новый пост', 'group': self.group.pk},
+            'post_edit': {'text': 'Исправленный', 'group': self.group.pk},
+            'add_comment': {'text': 'Новый комментарий'},
+            'profile_digest': {'digest': '1'},
+        }
+
+    def warm_caches(self):
+        """Очищает кеш, оставив прогретыми популярные посты и миниатюры
+        с параметрами из шаблонов.
+        """
+        cache.clear()
+        for post in Post.objects.all():
+            trending.record('comments', post.pk)
+            if post.image:
+                get_thumbnail(post.image, '960x339', crop='center',
+                              upscale=True)
+
+    def test_urls_fit_budgets(self):
+        for pattern in urlpatterns:
+            with self.subTest(name=pattern.name):
+                self.assertTrue(hasattr(pattern.callback, 'query_budget'))
+                self.warm_caches()
+                response = self.client.get(
+                    reverse(f'posts:{pattern.name}',
+                            args=self.url_args(pattern.name))
+                )
+                self.assertEqual(response.status_code,
+                                 self.GET_STATUSES.get(pattern.name, 200))
+
+    def test_writes_fit_budgets(self):
+        for name, data in self.post_cases().items():
+            with self.subTest(name=name):
+                self.warm_caches()
+                response = self.client.post(
+                    reverse(f'posts:{name}', args=self.url_args(name)), data
+                )
+                self.assertEqual(response.status_code, 302)
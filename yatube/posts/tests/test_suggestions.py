@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Post, Suggestion
+
+User = get_user_model()
+
+
+class SuggestionsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reader, cls.friend, cls.active, cls.quiet = (
+            User.objects.create_user(username=name)
+            for name in ('reader', 'friend', 'active', 'quiet')
+        )
+        Follow.objects.create(user=cls.reader, author=cls.friend)
+        Follow.objects.create(user=cls.friend, author=cls.active)
+        Follow.objects.create(user=cls.friend, author=cls.quiet)
+        Follow.objects.create(user=cls.friend, author=cls.reader)
+        Post.objects.create(text='Свежий пост', author=cls.active)
+
+    def setUp(self):
+        cache.clear()
+        call_command('compute_suggestions', stdout=StringIO())
+
+    def test_friends_of_friends_ranked_by_activity(self):
+        """Рекомендуются авторы друзей, активные — выше."""
+        self.assertEqual(
+            list(Suggestion.objects.filter(user=self.reader).values_list(
+                'author__username', flat=True
+            )),
+            ['active', 'quiet']
+        )
+
+    def test_follow_page_shows_stored_suggestions(self):
+        """Лента подписок выводит сохранённые рекомендации."""
+        client = Client()
+        client.force_login(self.reader)
+        Follow.objects.create(user=self.reader, author=self.quiet)
+        response = client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            [suggestion.author for suggestion in
+             response.context['suggestions']],
+            [self.active]
+        )
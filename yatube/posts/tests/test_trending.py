@@ -0,0 +1,76 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import trending
+from ..models import Comment, Post
+
+User = get_user_model()
+
+
+class TrendingTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='trending')
+        cls.quiet = Post.objects.create(text='Тихий', author=cls.author)
+        cls.hot = Post.objects.create(text='Горячий', author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def comment(self, post, count=1):
+        for number in range(count):
+            Comment.objects.create(
+                post=post, author=self.author, text=f'Комментарий {number}'
+            )
+
+    def test_comments_rank_posts(self):
+        """Посты упорядочены по числу свежих комментариев."""
+        self.comment(self.quiet)
+        self.comment(self.hot, 3)
+        self.assertEqual(trending.refresh(), [self.hot.pk, self.quiet.pk])
+
+    def test_old_activity_decays(self):
+        """Старые комментарии весят меньше новых и выпадают из окна."""
+        now = trending.current_bucket()
+        with mock.patch.object(trending, 'current_bucket',
+                               return_value=now - 3):
+            self.comment(self.hot, 3)
+        self.comment(self.quiet, 2)
+        self.assertEqual(trending.refresh(), [self.quiet.pk, self.hot.pk])
+        with mock.patch.object(trending, 'current_bucket',
+                               return_value=now + 20):
+            self.assertEqual(trending.refresh(), [])
+
+    def test_page_reads_precomputed_list(self):
+        """Страница показывает сохранённый список, не пересчитывая его."""
+        self.comment(self.hot)
+        trending.refresh()
+        self.comment(self.quiet, 5)
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(
+            [post.pk for post in response.context['posts']], [self.hot.pk]
+        )
+
+    def test_command_needs_shared_cache(self):
+        with self.assertRaises(CommandError):
+            call_command('refresh_trending', stdout=StringIO())
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }}):
+            self.comment(self.hot)
+            out = StringIO()
+            call_command('refresh_trending', stdout=out)
+            self.assertIn('Популярных постов: 1', out.getvalue())
+            self.assertEqual(cache.get(trending.TOP_KEY), [self.hot.pk])
@@ -0,0 +1,59 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import view_counts
+from ..models import Post
+
+User = get_user_model()
+
+
+class ViewCountsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='viewed')
+        cls.first = Post.objects.create(text='Первый', author=cls.author)
+        cls.second = Post.objects.create(text='Второй', author=cls.author)
+
+    def setUp(self):
+        view_counts.buffer.counts.clear()
+        view_counts.buffer.flushed_at = time.monotonic()
+
+    def test_flush_is_one_update_per_batch(self):
+        """Все накопленные просмотры записываются одним UPDATE."""
+        for post in (self.first, self.first, self.second):
+            view_counts.buffer.counts[post.pk] += 1
+        with CaptureQueriesContext(connection) as queries:
+            view_counts.buffer.flush()
+        self.assertEqual(len(queries), 1)
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.views, self.second.views), (2, 1))
+        self.assertEqual(view_counts.views(self.first), 2)
+
+    @override_settings(VIEW_COUNT_MAX_PENDING=3)
+    def test_post_page_buffers_views(self):
+        """Страница поста не пишет в базу, пока буфер не заполнится."""
+        url = reverse('posts:post_detail', args=[self.first.pk])
+        for expected in (1, 2):
+            response = self.client.get(url)
+            self.assertEqual(response.context['views'], expected)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.views, 0)
+        self.client.get(url)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.views, 3)
+
+    def test_idle_buffer_flushed_by_time(self):
+        """Без новых просмотров буфер сбрасывается по времени."""
+        view_counts.buffer.counts[self.first.pk] += 1
+        self.assertEqual(view_counts.buffer.flush_idle(), {})
+        with override_settings(VIEW_COUNT_FLUSH_SECONDS=0):
+            view_counts.buffer.flush_idle()
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.views, 1)
@@ -424,3 +424,37 @@ class FollowViewsTest(TestCase):
         )
         first_object = response.context.get('page_obj').object_list[0]
         self.assertNotEqual(first_object, new_post_author)
+
+    def test_follow_ajax_returns_json(self):
+        """XHR-подписка возвращает JSON вместо редиректа."""
+        url = reverse(
+            'posts:profile_follow',
+            kwargs={'username': self.author.username}
+        )
+        for _ in range(2):
+            response = self.authorized_client_not_author_1.get(
+                url, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+            )
+        self.assertEqual(
+            response.json(), {'following': True, 'followers_count': 1}
+        )
+        self.assertEqual(
+            Follow.objects.filter(user=self.user_1).count(), 1
+        )
+
+    def test_unfollow_single_delete(self):
+        """Отписка удаляет подписку одним DELETE без SELECT перед ним
+        и сообщает новое состояние.
+        """
+        Follow.objects.create(user=self.user_1, author=self.author)
+        url = reverse(
+            'posts:profile_unfollow',
+            kwargs={'username': self.author.username}
+        )
+        # Сессия, автор, DELETE и заново собранные подписки и счётчик.
+        with self.assertNumQueries(5):
+            response = self.authorized_client_not_author_1.get(
+                url, HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+            )
+        self.assertFalse(response.json()['following'])
+        self.assertFalse(Follow.objects.filter(user=self.user_1).exists())
@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Счётчики и готовый список лежат в кеше по умолчанию. Без общего
+# кеша (см. core.checks) каждый воркер ранжирует только свои события,
+# а refresh_trending их не видит вовсе.
+TOP_KEY = 'trending:top'
+WEIGHTS = {'comments': 1.0, 'views': 0.1}
+
+
+def current_bucket():
+    return int(time.time() // settings.TRENDING_BUCKET_SECONDS)
+
+
+def counter_key(kind, post_id, bucket):
+    return f'trending:{kind}:{post_id}:{bucket}'
+
+
+def active_key(bucket):
+    return f'trending:active:{bucket}'
+
+
+def record(kind, post_id):
+    """Увеличивает счётчик поста в текущем интервале окна.
+
+    Счётчик меняется атомарным cache.incr. Список активных постов
+    интервала обновляется без блокировки: при гонке пост может
+    выпасть из кандидатов до следующего события в этом интервале.
+    """
+    bucket = current_bucket()
+    timeout = settings.TRENDING_BUCKET_SECONDS * (
+        settings.TRENDING_WINDOW_BUCKETS + 1
+    )
+    key = counter_key(kind, post_id, bucket)
+    cache.add(key, 0, timeout)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout)
+    active = cache.get(active_key(bucket), set())
+    if post_id not in active:
+        active.add(post_id)
+        cache.set(active_key(bucket), active, timeout)
+
+
+def scores():
+    """Затухающий рейтинг постов, активных в скользящем окне."""
+    now = current_bucket()
+    buckets = range(now - settings.TRENDING_WINDOW_BUCKETS + 1, now + 1)
+    active = cache.get_many([active_key(bucket) for bucket in buckets])
+    candidates = set().union(*active.values())
+    keys = {
+        counter_key(kind, post_id, bucket): (kind, post_id, bucket)
+        for kind in WEIGHTS
+        for post_id in candidates
+        for bucket in buckets
+    }
+    result = dict.fromkeys(candidates, 0.0)
+    for key, count in cache.get_many(keys).items():
+        kind, post_id, bucket = keys[key]
+        result[post_id] += (
+            WEIGHTS[kind] * count * settings.TRENDING_DECAY ** (now - bucket)
+        )
+    return result
+
+
+def refresh():
+    """Пересчитывает и сохраняет список популярных постов."""
+    ranked = sorted(scores().items(), key=lambda item: item[1], reverse=True)
+    top = [post_id for post_id, _ in ranked[:settings.TRENDING_SIZE]]
+    cache.set(TOP_KEY, top, settings.TRENDING_REFRESH_SECONDS * 2)
+    return top
+
+
+def top_post_ids():
+    top = cache.get(TOP_KEY)
+    if top is None:
+        top = refresh()
+    return top
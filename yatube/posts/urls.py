@@ -6,7 +6,9 @@ app_name = 'posts'
 
 urlpatterns = [
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
+    path('groups/', views.group_index, name='group_index'),
     path('', views.index, name='index'),
+    path('trending/', views.trending_index, name='trending'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
@@ -27,4 +29,33 @@ urlpatterns = [
         views.profile_unfollow,
         name="profile_unfollow"
     ),
+    path(
+        'profile/<str:username>/digest/',
+        views.profile_digest,
+        name='profile_digest'
+    ),
+    path(
+        'profile/<str:username>/followers/',
+        views.follow_list,
+        {'kind': 'followers'},
+        name='followers'
+    ),
+    path(
+        'profile/<str:username>/following/',
+        views.follow_list,
+        {'kind': 'following'},
+        name='following'
+    ),
+    path(
+        'api/profile/<str:username>/followers/',
+        views.follow_list_api,
+        {'kind': 'followers'},
+        name='api_followers'
+    ),
+    path(
+        'api/profile/<str:username>/following/',
+        views.follow_list_api,
+        {'kind': 'following'},
+        name='api_following'
+    ),
 ]
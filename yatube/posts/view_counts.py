@@ -0,0 +1,116 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Value, When
+
+from core import objects
+from core.writer import write
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+
+def apply_counts(counts):
+    """Прибавляет просмотры одним UPDATE на каждые VIEW_COUNT_BATCH_SIZE
+    постов.
+    """
+    post_ids = list(counts)
+    for start in range(0, len(post_ids), settings.VIEW_COUNT_BATCH_SIZE):
+        batch = post_ids[start:start + settings.VIEW_COUNT_BATCH_SIZE]
+        Post.all_objects.filter(pk__in=batch).update(
+            views=F('views') + Case(
+                *(When(pk=pk, then=Value(counts[pk])) for pk in batch),
+                output_field=IntegerField()
+            )
+        )
+        objects.forget(Post, batch)
+
+
+class ViewBuffer:
+    """Копит просмотры постов в памяти процесса.
+
+    Буфер сбрасывается в базу, когда накопилось VIEW_COUNT_MAX_PENDING
+    просмотров или прошло VIEW_COUNT_FLUSH_SECONDS с прошлого сброса.
+    После start() по времени его сбрасывает и фоновый поток, даже если
+    новых просмотров нет, а при штатной остановке — atexit. При падении
+    воркера теряется не больше просмотров, чем набирается за эти
+    пределы.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.flushed_at = time.monotonic()
+        self.thread = None
+
+    def start(self):
+        """Запускает сброс по времени и при выходе; повторно не
+        запускает.
+        """
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(
+                target=self.loop, name='yatube-view-counts', daemon=True
+            )
+            self.thread.start()
+        atexit.register(self.flush)
+
+    def loop(self):
+        while True:
+            time.sleep(settings.VIEW_COUNT_FLUSH_SECONDS)
+            try:
+                self.flush_idle()
+            except Exception:
+                logger.exception('Просмотры не записаны')
+            finally:
+                connection.close()
+
+    def flush_idle(self):
+        """Сбрасывает буфер, если с прошлого сброса прошло
+        VIEW_COUNT_FLUSH_SECONDS.
+        """
+        if (time.monotonic() - self.flushed_at
+                >= settings.VIEW_COUNT_FLUSH_SECONDS):
+            return self.flush()
+        return Counter()
+
+    def add(self, post_id):
+        with self.lock:
+            self.counts[post_id] += 1
+            due = (
+                sum(self.counts.values()) >= settings.VIEW_COUNT_MAX_PENDING
+                or time.monotonic() - self.flushed_at
+                >= settings.VIEW_COUNT_FLUSH_SECONDS
+            )
+        if due:
+            self.flush()
+
+    def pending(self, post_id):
+        return self.counts[post_id]
+
+    def flush(self):
+        with self.lock:
+            counts, self.counts = self.counts, Counter()
+            self.flushed_at = time.monotonic()
+        if counts:
+            write(apply_counts, counts)
+        return counts
+
+
+buffer = ViewBuffer()
+
+
+def record(post_id):
+    buffer.add(post_id)
+
+
+def views(post):
+    """Просмотры поста с учётом ещё не сброшенных в базу."""
+    return post.views + buffer.pending(post.pk)
@@ -1,16 +1,26 @@
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
+
+from core.objects import get_cached_or_404
+from core.paginator import CachedCountPaginator
+from core.querybudget import query_budget
+from core.ratelimit import ratelimit
+from core.writer import write
 from users.forms import User
 
+from . import follow_graph, group_stats, trending, view_counts
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post
+from .fragments import attach_fragments
+from .models import Follow, Group, Post, Suggestion
 
 
+@query_budget(5)
 def index(request):
-    post_list = Post.objects.select_related('group').all()
-    paginator = Paginator(post_list, settings.PAGE_COUNT)
+    post_list = Post.objects.select_related('group').for_list()
+    paginator = CachedCountPaginator(post_list, settings.PAGE_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     context = {
@@ -19,12 +29,24 @@ def index(request):
     return render(request, 'posts/index.html', context)
 
 
+@query_budget(4)
+def trending_index(request):
+    top = trending.top_post_ids()
+    posts = Post.objects.select_related('group').for_list().in_bulk(top)
+    context = {
+        'posts': [posts[pk] for pk in top if pk in posts],
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+@query_budget(6)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    paginator = Paginator(posts, settings.PAGE_COUNT)
+    group = get_cached_or_404(Group, slug=slug)
+    posts = group.posts.for_list()
+    paginator = CachedCountPaginator(posts, settings.PAGE_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    page_obj.object_list = attach_fragments(page_obj)
     context = {
         'group': group,
         'page_obj': page_obj,
@@ -33,34 +55,53 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+@query_budget(3)
+def group_index(request):
+    context = {
+        'groups': group_stats.directory(),
+    }
+    return render(request, 'posts/group_index.html', context)
+
+
+@query_budget(7)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    paginator = Paginator(author.posts.all(), settings.PAGE_COUNT)
+    author = get_cached_or_404(User, username=username)
+    paginator = CachedCountPaginator(
+        author.posts.select_related('group').for_list(),
+        settings.PAGE_COUNT
+    )
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
-    following = (request.user.is_authenticated and Follow.objects.filter(
-        user=request.user,
-        author=author).exists()
-    )
+    following = follow_graph.is_following(request.user, author)
+    digest = following and Follow.objects.filter(
+        user=request.user, author=author, digest=True
+    ).exists()
     context = {
         'author': author,
         'paginator': paginator,
         'page_number': page_number,
         'page_obj': page_obj,
-        'following': following
+        'following': following,
+        'digest': digest,
+        'followers_count': follow_graph.followers_count(author.pk),
+        'following_count': follow_graph.following_count(author.pk),
     }
     return render(request, 'posts/profile.html', context)
 
 
+@query_budget(7)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_cached_or_404(Post, id=post_id)
+    trending.record('views', post.pk)
+    view_counts.record(post.pk)
     form = CommentForm()
     author = post.author
     posts_author = User.objects.filter(posts__author=author).count()
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
     context = {
         'post_id': post_id,
         'post': post,
+        'views': view_counts.views(post),
         'author': author,
         'posts_author': posts_author,
         'form': form,
@@ -69,13 +110,15 @@ def post_detail(request, post_id):
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(6)
 @login_required
+@ratelimit('posts:post_create', '20/m', methods=('POST',))
 def post_create(request):
     is_edit = True
     form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         form.instance.author = request.user
-        form.save()
+        write(form.save)
         return redirect('posts:profile', request.user.username)
     return render(request, 'posts/create_post.html',
                   context={'form': form,
@@ -84,6 +127,7 @@ def post_create(request):
                   )
 
 
+@query_budget(12)
 @login_required
 def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
@@ -106,41 +150,122 @@ def post_edit(request, post_id):
                   )
 
 
+@query_budget(4)
 @login_required
+@ratelimit('posts:add_comment', '20/m', methods=('POST',))
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_cached_or_404(Post, id=post_id)
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        write(comment.save)
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@query_budget(6)
 @login_required
 def follow_index(request):
-    post_list = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(post_list, settings.PAGE_COUNT)
+    post_list = Post.objects.filter(
+        author__following__user=request.user
+    ).select_related('group').for_list()
+    paginator = CachedCountPaginator(post_list, settings.PAGE_COUNT)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
+    following = follow_graph.following_ids(request.user.pk)
+    suggestions = [
+        suggestion for suggestion in
+        Suggestion.objects.filter(user=request.user).select_related('author')
+        if not follow_graph.contains(following, suggestion.author_id)
+    ][:settings.SUGGESTIONS_COUNT]
     context = {
         'page_obj': page_obj,
+        'suggestions': suggestions,
     }
     return render(request, 'posts/follow.html', context)
 
 
+def follow_response(request, author):
+    """JSON для XHR-запросов, редирект на профиль для остальных."""
+    if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+        return JsonResponse({
+            'following': follow_graph.is_following(request.user, author),
+            'followers_count': follow_graph.followers_count(author.pk),
+        })
+    return redirect('posts:profile', username=author.username)
+
+
+@query_budget(5)
 @login_required
+@ratelimit('posts:profile_follow', '60/m')
 def profile_follow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_cached_or_404(User, username=username)
     if author != request.user:
-        Follow.objects.get_or_create(user=request.user, author=author)
-    return redirect('posts:profile', username=username)
+        write(follow_graph.follow, request.user, author)
+    return follow_response(request, author)
 
 
+@query_budget(6)
 @login_required
+@ratelimit('posts:profile_unfollow', '60/m')
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
-    if Follow.objects.filter(user=request.user, author=author).exists():
-        Follow.objects.filter(user=request.user, author=author).delete()
-    return redirect('posts:profile', username=username)
+    author = get_cached_or_404(User, username=username)
+    write(follow_graph.unfollow, request.user, author)
+    return follow_response(request, author)
+
+
+@query_budget(4)
+@login_required
+@require_POST
+def profile_digest(request, username):
+    author = get_cached_or_404(User, username=username)
+    write(follow_graph.set_digest, request.user, author,
+          request.POST.get('digest') == '1')
+    return redirect('posts:profile', username=author.username)
+
+
+FOLLOW_LISTS = {
+    'followers': follow_graph.follower_ids,
+    'following': follow_graph.following_ids,
+}
+
+
+def follow_list_page(request, username, kind):
+    """Страница списка подписчиков или подписок с курсором after."""
+    author = get_cached_or_404(User, username=username)
+    after = request.GET.get('after')
+    page, next_cursor = follow_graph.keyset_page(
+        FOLLOW_LISTS[kind](author.pk),
+        after=int(after) if after and after.isdigit() else None
+    )
+    users = User.objects.in_bulk(page)
+    return author, [users[pk] for pk in page if pk in users], next_cursor
+
+
+@query_budget(5)
+def follow_list(request, username, kind):
+    author, users, next_cursor = follow_list_page(request, username, kind)
+    context = {
+        'author': author,
+        'kind': kind,
+        'users': users,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'posts/follow_list.html', context)
+
+
+@query_budget(3)
+def follow_list_api(request, username, kind):
+    author, users, next_cursor = follow_list_page(request, username, kind)
+    return JsonResponse({
+        'results': [
+            {
+                'id': user.pk,
+                'username': user.username,
+                'full_name': user.get_full_name(),
+            }
+            for user in users
+        ],
+        'next': next_cursor,
+    })
@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+
+from posts.admin import SoftDeleteMixin
+from posts.deletion import soft_delete_user
+
+User = get_user_model()
+
+
+class SoftDeleteUserAdmin(SoftDeleteMixin, UserAdmin):
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            soft_delete_user(user)
+
+
+admin.site.unregister(User)
+admin.site.register(User, SoftDeleteUserAdmin)
@@ -0,0 +1,281 @@
+"""
+Common Django settings for yatube project.
+
+Environment-specific values live in ``dev`` and ``prod``.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'sy6b5)=+zfql)hmc6k-$%m)--p_xs_z2yeich+f-a=r3ss*4kg'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'about.apps.AboutConfig',
+    'core.apps.CoreConfig',
+    'users.apps.UsersConfig',
+    'posts.apps.PostsConfig',
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.slowlog.SlowQueryMiddleware',
+    'core.template_profiler.TemplateProfilerMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.ratelimit.RateLimitMiddleware',
+    'core.profiler.ProfilerMiddleware',
+    'core.writer.WriteQueueMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ]
+        },
+    }
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+    }
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
+STATICFILES_FINDERS = (
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+)
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+
+# Письма копятся в core.OutboxMessage, задача send_outbox отправляет их
+# порциями по OUTBOX_BATCH_SIZE через одно соединение OUTBOX_BACKEND.
+# Неушедшее письмо повторяется с паузой от OUTBOX_RETRY_DELAY секунд,
+# удваивающейся с каждой попыткой, до OUTBOX_MAX_ATTEMPTS попыток.
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+OUTBOX_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+# Адрес сайта для ссылок в письмах, которые уходят вне запроса.
+SITE_URL = 'http://127.0.0.1:8000'
+
+PAGE_COUNT = 10
+
+# LocMemCache свой в каждом процессе и годится только для разработки
+# и тестов. Инвалидация по сигналам, лимиты частоты, популярные посты
+# и сводка slow_queries рассчитаны на общий кеш, его задаёт prod.py.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = ['core.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 60 * 15
+
+# Прогрев воркера в yatube/wsgi.py до приёма трафика.
+WARMUP_ON_START = False
+WARMUP_URLS = ['/', '/about/author/', '/about/tech/']
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Выборки от этого размера пагинируются по закешированному числу записей.
+PAGINATOR_ESTIMATE_THRESHOLD = 10000
+PAGINATOR_COUNT_TTL = 60
+
+POST_FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+FOLLOW_GRAPH_TIMEOUT = 60 * 60
+
+SUGGESTIONS_COUNT = 5
+
+# Лимиты частоты запросов вида '10/m'. RATELIMITS переопределяет лимиты
+# по имени URL, RATELIMIT_GLOBAL действует на все запросы клиента.
+RATELIMITS = {}
+RATELIMIT_GLOBAL = None
+# Откуда брать IP анонимного клиента. За обратным прокси —
+# 'HTTP_X_FORWARDED_FOR' и число своих прокси в RATELIMIT_TRUSTED_PROXIES.
+RATELIMIT_IP_HEADER = 'REMOTE_ADDR'
+RATELIMIT_TRUSTED_PROXIES = 1
+
+# Запись из post_create, add_comment и подписок через один поток-писатель.
+# Запись, не дождавшаяся очереди за WRITE_QUEUE_TIMEOUT секунд,
+# отменяется, а запрос получает 503 с Retry-After.
+WRITE_QUEUE_ENABLED = False
+WRITE_QUEUE_BATCH_SIZE = 50
+WRITE_QUEUE_TIMEOUT = 10
+
+GROUP_DIRECTORY_TIMEOUT = 60 * 60
+
+# Популярные посты: окно из TRENDING_WINDOW_BUCKETS интервалов,
+# вклад интервала затухает в TRENDING_DECAY раз с каждым шагом.
+TRENDING_BUCKET_SECONDS = 5 * 60
+TRENDING_WINDOW_BUCKETS = 12
+TRENDING_DECAY = 0.8
+TRENDING_SIZE = 20
+TRENDING_REFRESH_SECONDS = 60
+
+# Просмотры постов копятся в памяти воркера и сбрасываются в базу
+# пачками: не реже VIEW_COUNT_FLUSH_SECONDS секунд (в том числе без
+# новых просмотров и при остановке, см. yatube/wsgi.py) или по
+# VIEW_COUNT_MAX_PENDING просмотрам.
+VIEW_COUNT_FLUSH_SECONDS = 10
+VIEW_COUNT_MAX_PENDING = 500
+VIEW_COUNT_BATCH_SIZE = 500
+
+# Кеш объектов, которые view ищут по pk, slug и username.
+OBJECT_CACHE_TIMEOUT = 60 * 5
+OBJECT_CACHE_MISS_TIMEOUT = 30
+
+# Проверка бюджетов числа SQL-запросов: None — выключена, 'log' —
+# превышение логируется, 'raise' — падает с QueryBudgetExceeded.
+# QUERY_BUDGETS задаёт бюджеты по имени URL для QueryBudgetMiddleware.
+QUERY_BUDGET_MODE = None
+QUERY_BUDGETS = {}
+
+# Запросы дольше этого числа миллисекунд попадают в сводку
+# slow_queries вместе с планом. None выключает журнал.
+SLOW_QUERY_THRESHOLD_MS = None
+
+# Профилирование запросов по требованию: каталог для .prof и
+# .collapsed, интервал сэмплера в секундах и срок жизни токена.
+PROFILER_DIR = None
+PROFILER_SAMPLE_INTERVAL = 0.001
+PROFILER_TOKEN_MAX_AGE = 60 * 60
+
+# Заголовок Server-Timing с TEMPLATE_PROFILER_TOP самыми долгими
+# шаблонами, тегами и фильтрами запроса.
+TEMPLATE_PROFILER = False
+TEMPLATE_PROFILER_TOP = 15
+
+# Очередь фоновых задач core.Job: срок, на который воркер забирает
+# задачу, число попыток и начальная пауза перед повтором в секундах.
+JOB_VISIBILITY_TIMEOUT = 5 * 60
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_DELAY = 10
+
+# Порции фонового удаления мягко удалённых объектов.
+PURGE_BATCH_SIZE = 500
+PURGE_SLEEP = 0.05
+
+# Дайджест новых постов для подписчиков, которые его включили:
+# одно письмо на получателя за DIGEST_HOURS часов.
+DIGEST_HOURS = 24
@@ -0,0 +1,23 @@
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = True
+
+INSTALLED_APPS = INSTALLED_APPS + ['debug_toolbar']
+
+MIDDLEWARE = MIDDLEWARE + [
+    'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'core.querybudget.QueryBudgetMiddleware',
+]
+
+QUERY_BUDGET_MODE = 'log'
+
+TEMPLATE_PROFILER = True
+
+PROFILER_DIR = os.path.join(BASE_DIR, 'profiles')
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
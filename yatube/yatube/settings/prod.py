@@ -0,0 +1,63 @@
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import TEMPLATES_DIR
+
+DEBUG = False
+
+SECRET_KEY = os.environ['SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ.get(
+    'ALLOWED_HOSTS', 'localhost,127.0.0.1'
+).split(',')
+
+# Шаблоны компилируются один раз на процесс, а не на каждый запрос.
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    }
+]
+
+# Общий кеш для всех воркеров и management-команд.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.memcached.MemcachedCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', '127.0.0.1:11211'),
+    }
+}
+
+WARMUP_ON_START = os.environ.get('WARMUP_ON_START', '1') == '1'
+
+RATELIMIT_GLOBAL = '600/m'
+RATELIMIT_IP_HEADER = os.environ.get('RATELIMIT_IP_HEADER', 'REMOTE_ADDR')
+RATELIMIT_TRUSTED_PROXIES = int(
+    os.environ.get('RATELIMIT_TRUSTED_PROXIES', 1)
+)
+
+SLOW_QUERY_THRESHOLD_MS = int(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+
+PROFILER_DIR = os.environ.get('PROFILER_DIR')
+
+OUTBOX_BACKEND = os.environ.get(
+    'OUTBOX_BACKEND', 'django.core.mail.backends.smtp.EmailBackend'
+)
+
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost')